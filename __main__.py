@@ -21,9 +21,13 @@ Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 Version)
 """
 from app import Invaders
+from consts import GAME_FPS
 from consts import GAME_HEIGHT
+from consts import GAME_MAX_STEPS
+from consts import GAME_TIMESTEP
 from consts import GAME_WIDTH
 
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH, height=GAME_HEIGHT).run()
+    Invaders(width=GAME_WIDTH, height=GAME_HEIGHT, fps=GAME_FPS,
+             timestep=GAME_TIMESTEP, max_steps=GAME_MAX_STEPS).run()
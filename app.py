@@ -3,6 +3,8 @@ Primary module for Alien Invaders
 
 This module contains the main controller class for the Alien Invaders application.
 """
+import random
+
 from wave import *
 from consts import *
 from game2d import *
@@ -68,9 +70,19 @@ class Invaders(GameApp):
     _alienspeed: The number of seconds between alien steps
             [a float 0 < speed <= 1]
     _gamescore: The score that the player has achieved in the game
-            [GLabel Object]
+            [GBitmapLabel Object]
     _scorekeeper: The score that the player has acheived in the game
             [an int >= 0]
+    _rng: The random number generator that seeds each new wave
+            [random.Random, seeded with RANDOM_SEED]
+    _shownwave: The wave attached to the view
+            [Wave, or None if no wave is on screen]
+    _showntext: The message attached to the view
+            [GLabel, or None if no message is on screen]
+    _loading: The message showing how much of the game has loaded
+            [GBitmapLabel, or None once everything has loaded]
+    _sounds: The sound effects shared by every wave
+            [SoundLibrary, or None until the first wave starts]
     """
 
     # THREE MAIN GAMEAPP METHODS
@@ -86,19 +98,32 @@ class Invaders(GameApp):
         invariants. When done, it sets the _state to STATE_INACTIVE and create a message
         (in attribute _text) saying that the user should press to play a game.
         """
+        # Pack the images into one texture before anything loads them
+        GameApp.load_atlas(ATLAS_NAME, ATLAS_IMAGES, ATLAS_SIZE)
+        # Load everything else in the background while the welcome screen shows
+        self.preload(voices=SOUND_VOICES)
         # Create Game Attributes
         self._state = STATE_INACTIVE
         self._round = 1
         self._scorekeeper = 0
         self._lastroundscore = 0
-        self._gamescore = GLabel(text="Score: " + str(self._scorekeeper))
-        self._gamescore.linecolor = "white"
-        self._gamescore.x = GAME_WIDTH/8
-        self._gamescore.y = GAME_HEIGHT-(ALIEN_CEILING/2)
-        self._gamescore.font_name = 'RetroGame.ttf'
-        self._gamescore.font_size = 25
+        self._rng = random.Random(RANDOM_SEED)
+        self._sounds = None
+        # The score and loading messages change often, so they are drawn from glyphs
+        self._gamescore = GBitmapLabel(text="Score: " + str(self._scorekeeper),
+                                       x=GAME_WIDTH/8, y=GAME_HEIGHT-(ALIEN_CEILING/2),
+                                       font_size=25, font_name='RetroGame.ttf',
+                                       linecolor="white")
         self._background = GRectangle(width=GAME_WIDTH, height=GAME_HEIGHT,
                                       fillcolor="black", x=GAME_WIDTH/2, y=GAME_HEIGHT/2)
+        # The view is retained, so the background is only attached once
+        self._background.attach(self.view, LAYER_BACKGROUND)
+        self._shownwave = None
+        self._showntext = None
+        self._loading = GBitmapLabel(text="Loading 0%", x=GAME_WIDTH/2.0,
+                                     y=ALIEN_CEILING/2.0, font_size=25,
+                                     font_name='RetroGame.ttf', linecolor="white")
+        self._loading.attach(self.view, LAYER_TEXT)
         # Show starting message
         if self._state == STATE_INACTIVE:
             self._show_welcome_message()
@@ -197,17 +222,47 @@ class Invaders(GameApp):
         Wave. In order to draw them, you either need to add getters for these attributes
         or you need to add a draw method to class Wave.  We suggest the latter.  See
         the example subcontroller.py from class.
+
+        The objects are attached to the view in retained mode, so they stay on screen
+        between frames.  This method only attaches and detaches the wave, the score and
+        the message when they change.
         """
-        self._background.draw(self.view)
+        # Show the wave and score only if Game is Active or Paused
+        wave = None
         if self._state == STATE_ACTIVE or self._state == STATE_PAUSED:
-            # Show only if Game is Active or Paused
-            self._wave.draw(self.view)
-            self._gamescore.draw(self.view)
-        if not self._text is None:
-            # Show if text is there
-            self._text.draw(self.view)
+            wave = self._wave
+        if not self._shownwave is None and not self._shownwave is wave:
+            self._shownwave.detach()
+        self._shownwave = wave
+        if wave is None:
+            self._gamescore.detach(self.view)
+        else:
+            wave.draw(self.view)
+            self._gamescore.attach(self.view, LAYER_TEXT)
+        # Show the loading progress until everything has loaded
+        self._show_progress()
+        # Show the message if text is there
+        if not self._showntext is self._text:
+            if not self._showntext is None:
+                self._showntext.detach(self.view)
+            if not self._text is None:
+                self._text.attach(self.view, LAYER_TEXT)
+            self._showntext = self._text
     # First Game Beginning Helper Methods
 
+    def _show_progress(self):
+        """
+        Updates the loading message, removing it once everything has loaded
+        """
+        if self._loading is None:
+            return
+        percent = int(100*self.preload_progress)
+        if percent >= 100:
+            self._loading.detach(self.view)
+            self._loading = None
+        elif self._loading.text != "Loading " + str(percent) + "%":
+            self._loading.text = "Loading " + str(percent) + "%"
+
     def _show_welcome_message(self):
         """
         Returns: GLabel Object
@@ -356,8 +411,11 @@ class Invaders(GameApp):
         STATE_ACTIVE. It creates a new Wave object and assigns it to
         the attribute _wave.
         """
-        # Create New Wave
-        self._wave = Wave()
+        # Load the sounds once, after the welcome screen has given them time to preload
+        if self._sounds is None:
+            self._sounds = load_sounds()
+        # Create New Wave, seeded so a game can be replayed from RANDOM_SEED
+        self._wave = Wave(seed=self._rng.getrandbits(32), sounds=self._sounds)
         if self._round > 1:
             # Change Lives to reflect actually amount
             lives = self._previouslives + 1
@@ -16,6 +16,12 @@ import sys
 GAME_WIDTH = 800
 #: the height of the game display
 GAME_HEIGHT = 700
+#: the number of frames per second to draw
+GAME_FPS = 60
+#: the number of seconds simulated per update (the game logic runs at this fixed rate)
+GAME_TIMESTEP = 1/60
+#: the most updates to run in one frame when catching up after a slow frame
+GAME_MAX_STEPS = 5
 
 
 ### SHIP CONSTANTS ###
@@ -70,6 +76,10 @@ BOLT_HEIGHT = 16
 BOLT_SPEED = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE = 5
+# the number of bolts the player may have on screen at once
+SHIP_BOLT_LIMIT = 1
+# the number of bolt views to build ahead of time (the pool grows if it runs out)
+BOLT_POOL_SIZE = 8
 
 
 ### GAME CONSTANTS ###
@@ -93,11 +103,11 @@ STATE_COMPLETE = 5
 sys.argv is a list of the command line arguments when you run Python. These
 arguments are everything after the word python. So if you start the game typing
 
-    python invaders 3 4 0.5
+    python invaders 3 4 0.5 42
 
-Python puts ['breakout.py', '3', '4', '0.5'] into sys.argv. Below, we take
-advantage of this fact to change the constants ALIEN_ROWS, ALIENS_IN_ROW, and
-ALIEN_SPEED.
+Python puts ['breakout.py', '3', '4', '0.5', '42'] into sys.argv. Below, we take
+advantage of this fact to change the constants ALIEN_ROWS, ALIENS_IN_ROW,
+ALIEN_SPEED, and RANDOM_SEED.
 """
 try:
     rows = int(sys.argv[1])
@@ -120,14 +130,44 @@ try:
 except:
     pass  # Use original value
 
+# The seed for the random numbers of a game (None seeds from the system)
+RANDOM_SEED = None
+
+try:
+    RANDOM_SEED = int(sys.argv[4])
+except:
+    pass  # Use original value
+
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
 
 # The Number of Points Each Killed Alien gives the player
 ALIEN_POINTS = 75
 
+# The Number of Points for killing each type of alien (one per image in ALIEN_IMAGES)
+ALIEN_TYPE_POINTS = (ALIEN_POINTS, ALIEN_POINTS, ALIEN_POINTS)
+
 # The Number of Points the Player gets for surving each round
 ROUND_POINTS = 150
 
 # The factor that the speed of the aliens is multiplied by after each round
 # and after each dead alien
 A_SPEED_FAC = 0.98
+
+# The layers the game objects are attached to the view in (higher layers are on top)
+LAYER_BACKGROUND = 0
+LAYER_GAME = 1
+LAYER_TEXT = 2
+
+# The atlas that packs the images into one texture (built once, in the user data folder)
+ATLAS_NAME = 'invaders'
+# The images packed into the atlas
+ATLAS_IMAGES = ALIEN_IMAGES + ('ship.png', 'ship-strip.png', 'alien-strip1.png',
+                               'alien-strip2.png', 'alien-strip3.png')
+# The width and height of an atlas page
+ATLAS_SIZE = 512
+
+# The number of copies of each sound effect that can play at once
+SOUND_VOICES = 4
+# The sound effect played for each event of the simulation
+SOUND_EFFECTS = {'shipbolt': 'pew1.wav', 'alienbolt': 'pew2.wav',
+                 'shipdie': 'blast3.wav', 'aliendie': 'blast1.wav'}
@@ -4,13 +4,47 @@ A module to support simple 2D game development.
 This module is a simple wrapper around Kivy interfaces to make 2D game development
 simpler for students in CS 1110.
 
+The classes of this module are loaded the first time they are used.  That way, code
+that only needs the parts without Kivy (such as the collision tests) never loads Kivy.
+The drawables and sounds also wait to import Kivy until one is created, so a module can
+subclass them without loading Kivy.  Use ``python -m game2d.importtime`` to check how
+long a module takes to import, and whether it loads Kivy.
+
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from .gobject import GObject, GScene
-from .grectangle import GRectangle, GEllipse, GImage, GLabel
-from .gsprite import GSprite
-from .gpath import GPath, GTriangle, GPolygon
-from .gview import GInput, GView
-from .sound import Sound, SoundLibrary
-from .app import GameApp
\ No newline at end of file
+
+# The submodule defining each class in this package
+_EXPORTS = {
+    'GObject': 'gobject', 'GScene': 'gobject',
+    'GRectangle': 'grectangle', 'GEllipse': 'grectangle', 'GImage': 'grectangle',
+    'GLabel': 'grectangle',
+    'GSprite': 'gsprite',
+    'GSpriteBatch': 'gbatch',
+    'GBitmapLabel': 'gfont', 'GlyphAtlas': 'gfont',
+    'GPath': 'gpath', 'GTriangle': 'gpath', 'GPolygon': 'gpath',
+    'GInput': 'gview', 'GView': 'gview',
+    'Sound': 'sound', 'SoundLibrary': 'sound',
+    'Mixer': 'mixer', 'NullSink': 'mixer', 'DeviceSink': 'mixer',
+    'GameApp': 'app',
+    'SpatialHash': 'collision', 'aabb_overlap': 'collision', 'aabb_overlaps': 'collision',
+    'aabb_hits': 'collision',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """
+    Loads a class of this package on first use.
+
+    :param name: The name of the class
+    :type name:  ``str``
+    """
+    if name not in _EXPORTS:
+        raise AttributeError('module %s has no attribute %s' % (repr(__name__),repr(name)))
+    import importlib
+    module = importlib.import_module('.'+_EXPORTS[name],__name__)
+    value = getattr(module,name)
+    globals()[name] = value
+    return value
@@ -16,6 +16,8 @@ from kivy.config import Config
 from kivy.clock  import Clock
 
 import os.path
+import weakref
+from collections import OrderedDict
 
 class GameApp(kivy.app.App):
     """
@@ -36,8 +38,53 @@ class GameApp(kivy.app.App):
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
     """
-    # Class attribute for tracking textures (to reduce memory footprint)
-    TEXTURE_CACHE = {}
+    # Class attribute for tracking textures (to reduce memory footprint), oldest first
+    TEXTURE_CACHE = OrderedDict()
+    
+    # Class attribute for the approximate size in bytes of each cached texture
+    TEXTURE_SIZES = {}
+    
+    # Class attribute for the number of bytes of cached textures to keep (None for no limit)
+    TEXTURE_BUDGET = 64*1024*1024
+    
+    # Class attribute for the texture pinned by each live object
+    TEXTURE_PINS = weakref.WeakKeyDictionary()
+    
+    # Class attribute for the texture cache statistics
+    TEXTURE_STATS = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    # Class attribute for the rendered label text, oldest first
+    LABEL_CACHE = OrderedDict()
+    
+    # Class attribute for the size in bytes of each rendered label text
+    LABEL_SIZES = {}
+    
+    # Class attribute for the number of bytes of rendered label text to keep
+    LABEL_BUDGET = 8*1024*1024
+    
+    # Class attribute for the label cache statistics
+    LABEL_STATS = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    # Class attribute for sharing the glyph atlases of fonts, keyed by (font name, size)
+    GLYPH_CACHE = {}
+    
+    # Class attribute for the preloaded Kivy sounds not yet used by a Sound, by file name
+    SOUND_CACHE = {}
+    
+    # Class attribute for the mixer that sounds play through (None to use Kivy audio)
+    MIXER = None
+    
+    # Class attribute for the seconds of each frame to spend finishing preloaded assets
+    PRELOAD_SLICE = 0.004
+    
+    # Class attribute for tracking the loaded texture atlases
+    ATLAS_CACHE = {}
+    
+    # Class attribute for the folder to build atlases in (None for the user data folder)
+    ATLAS_FOLDER = None
+    
+    # Class attribute for sharing the frames of filmstrips, keyed by (file name, format)
+    FRAME_CACHE = {}
     
     
     # MUTABLE ATTRIBUTES
@@ -62,6 +109,49 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def timestep(self):
+        """
+        The number of seconds simulated by each call to :meth:`update`.
+        
+        If this value is None (the default), :meth:`update` is called once per animation 
+        frame with the time since the last frame.  Otherwise, the game runs a fixed 
+        timestep loop: the time since the last frame is added to an accumulator, and 
+        :meth:`update` is called with exactly ``timestep`` seconds for every full step 
+        in the accumulator.  The simulation then runs at the same rate no matter what
+        the ``fps`` is, so you can draw less often without changing the gameplay.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._timestep
+    
+    @timestep.setter
+    def timestep(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._timestep = value
+        self._accumulator = 0.0
+    
+    @property
+    def max_steps(self):
+        """
+        The maximum number of fixed timesteps to simulate in a single animation frame.
+        
+        When frames run slow, the accumulator can hold more time than the game can 
+        catch up on.  At most this many steps are simulated per frame, and any time 
+        left over is dropped.  This keeps a slow frame from causing an even slower 
+        frame.  This value is ignored if ``timestep`` is None.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._maxsteps
+    
+    @max_steps.setter
+    def max_steps(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._maxsteps = value
+    
     
     # IMMUTABLE PROPERTIES
     @property
@@ -106,6 +196,18 @@ class GameApp(kivy.app.App):
         """
         return self._input
     
+    @property
+    def preload_progress(self):
+        """
+        The fraction of the assets loaded by :meth:`preload` so far.
+        
+        This value is 1 if the game is not preloading.  Use it to show a progress bar
+        (or message) while the assets load.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        return 1.0 if self._preloader is None else self._preloader.progress
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
@@ -170,6 +272,13 @@ class GameApp(kivy.app.App):
         has already been loaded, it will return the cached texture.  Otherwise, it will
         load the texture and cache it before returning it.
         
+        If the image was packed into an atlas with :meth:`load_atlas`, the texture is
+        a region of the atlas texture.
+        
+        The cache is bounded by ``TEXTURE_BUDGET`` bytes.  When it grows past that, the
+        least recently used textures are evicted, except for those pinned by a live 
+        object (see :meth:`pin_texture`).
+        
         This method will crash if name is not a valid file.
         
         :param name: The file name
@@ -177,12 +286,15 @@ class GameApp(kivy.app.App):
         """
         assert cls.is_image(name), '%s is not an image file' % repr(name)
         if name in cls.TEXTURE_CACHE:
+            cls.TEXTURE_STATS['hits'] += 1
+            cls.TEXTURE_CACHE.move_to_end(name)
             return cls.TEXTURE_CACHE[name]
         
+        cls.TEXTURE_STATS['misses'] += 1
         try:
             from kivy.core.image import Image
             texture = Image(name).texture
-            cls.TEXTURE_CACHE[name] = texture
+            cls._cache_texture(name,texture)
         except:
             texture = None
         
@@ -201,13 +313,250 @@ class GameApp(kivy.app.App):
         :type name:  ``str``
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
+        for key in [key for key in cls.FRAME_CACHE if key[0] == name]:
+            del cls.FRAME_CACHE[key]
         if name in cls.TEXTURE_CACHE:
             texture = cls.TEXTURE_CACHE[name]
             del cls.TEXTURE_CACHE[name]
+            del cls.TEXTURE_SIZES[name]
             return texture
         
         return None
     
+    @classmethod
+    def pin_texture(cls,owner,name):
+        """
+        Pins the texture for the given file name for as long as ``owner`` is alive.
+        
+        A pinned texture is never evicted from the texture cache.  Each object pins at 
+        most one texture, so pinning a new texture releases the old one.  Pinning None 
+        releases the texture of ``owner``.  The pin is released automatically when the 
+        object is garbage collected.
+        
+        :param owner: The object using the texture
+        :type owner:  any object that supports weak references
+        
+        :param name: The file name
+        :type name:  ``str`` or None
+        """
+        if name is None:
+            cls.TEXTURE_PINS.pop(owner,None)
+        else:
+            cls.TEXTURE_PINS[owner] = name
+    
+    @classmethod
+    def texture_stats(cls):
+        """
+        Returns: The statistics of the texture cache, as a dictionary
+        
+        The dictionary has the number of cache ``hits``, ``misses`` and ``evictions``
+        since the game started, as well as the number of ``textures`` in the cache, 
+        their total size in ``bytes``, the ``budget`` and the number of ``pinned`` 
+        textures.
+        """
+        result = dict(cls.TEXTURE_STATS)
+        result['textures'] = len(cls.TEXTURE_CACHE)
+        result['bytes'] = sum(cls.TEXTURE_SIZES.values())
+        result['budget'] = cls.TEXTURE_BUDGET
+        result['pinned'] = len(set(cls.TEXTURE_PINS.values()))
+        return result
+    
+    @classmethod
+    def render_text(cls,text,font_name,font_size,bold,color,halign,options=()):
+        """
+        Returns: The texture of the given text, or None if there is nothing to draw
+        
+        Text is rendered once for each combination of text, font, size, color, 
+        alignment and options.  Rendering the same text again returns the cached texture, so labels
+        that switch between a few strings (such as a score) only render each string
+        once.  The cache is bounded by ``LABEL_BUDGET`` bytes.  When it grows past that,
+        the least recently used textures are dropped.  A label still showing a dropped
+        texture keeps it until it changes.
+        
+        :param text: The text to render
+        :type text:  ``str``
+        
+        :param font_name: The font name, or the file name of a font in the **Fonts** folder
+        :type font_name:  ``str``
+        
+        :param font_size: The size of the text font in points
+        :type font_size:  ``int`` or ``float``
+        
+        :param bold: Whether the text is bold
+        :type bold:  ``bool``
+        
+        :param color: The text color
+        :type color:  4-element ``tuple`` of ``float``
+        
+        :param halign: The alignment of the lines of the text
+        :type halign:  one of 'left', 'right', or 'center'
+        
+        :param options: Any other keywords of the Kivy core Label (with 'markup' to use 
+            a Kivy MarkupLabel instead)
+        :type options:  sorted ``tuple`` of (``str``, hashable value) pairs
+        """
+        key = (text,font_name,font_size,bold,color,halign,options)
+        if key in cls.LABEL_CACHE:
+            cls.LABEL_STATS['hits'] += 1
+            cls.LABEL_CACHE.move_to_end(key)
+            return cls.LABEL_CACHE[key]
+        
+        cls.LABEL_STATS['misses'] += 1
+        extra = dict(options)
+        if extra.pop('markup',False):
+            from kivy.core.text.markup import MarkupLabel as CoreLabel
+        else:
+            from kivy.core.text import Label as CoreLabel
+        label = CoreLabel(text=text,font_name=font_name,font_size=font_size,bold=bold,
+                          color=color,halign=halign,**extra)
+        label.refresh()
+        texture = label.texture
+        cls.LABEL_CACHE[key] = texture
+        cls.LABEL_SIZES[key] = 0 if texture is None else texture.width*texture.height*4
+        
+        total = sum(cls.LABEL_SIZES.values())
+        for old in list(cls.LABEL_CACHE):
+            if total <= cls.LABEL_BUDGET:
+                break
+            if old != key:
+                total -= cls.LABEL_SIZES.pop(old)
+                del cls.LABEL_CACHE[old]
+                cls.LABEL_STATS['evictions'] += 1
+        return texture
+    
+    @classmethod
+    def load_glyphs(cls,font_name,font_size):
+        """
+        Returns: The glyph atlas for the given font and size
+        
+        The glyphs of the font are rendered into an atlas the first time it is asked 
+        for.  After that, the same atlas is returned, so every ``GBitmapLabel`` using
+        that font and size shares it.
+        
+        :param font_name: The font name, or the file name of a font in the **Fonts** folder
+        :type font_name:  ``str``
+        
+        :param font_size: The size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        key = (font_name,font_size)
+        if not key in cls.GLYPH_CACHE:
+            from .gfont import GlyphAtlas
+            cls.GLYPH_CACHE[key] = GlyphAtlas(font_name,font_size)
+        return cls.GLYPH_CACHE[key]
+    
+    @classmethod
+    def load_frames(cls,name,format):
+        """
+        Returns: The frames of the filmstrip for the given file name, or None if it 
+        cannot be loaded
+        
+        The image is divided into a grid of frames with ``format`` rows and columns.
+        The frames are listed left-to-right, top-to-bottom, as regions of the texture
+        from :meth:`load_texture`.  They are sliced once and cached, so every sprite that
+        uses the same filmstrip shares them.  Unloading the texture also drops its frames.
+        
+        :param name: The file name
+        :type name:  ``str``
+        
+        :param format: The number of rows and columns of frames
+        :type format:  2-element ``tuple`` of ``int`` > 0
+        """
+        key = (name,format)
+        if key in cls.FRAME_CACHE:
+            return cls.FRAME_CACHE[key]
+        
+        texture = cls.load_texture(name)
+        if texture is None:
+            return None
+        
+        rows, cols = format
+        width  = texture.width/cols
+        height = texture.height/rows
+        frames = []
+        for row in range(rows):
+            ty = int(row*height)
+            for col in range(cols):
+                tx = int(col*width)
+                frames.append(texture.get_region(tx,texture.height-ty-int(height),
+                                                 int(width),int(height)))
+        frames = tuple(frames)
+        cls.FRAME_CACHE[key] = frames
+        return frames
+    
+    @classmethod
+    def load_atlas(cls,name,sources=(),size=512):
+        """
+        Returns: The atlas of the given name, or None if it cannot be built or loaded
+        
+        An atlas packs many images into a single texture, so that a batched drawable 
+        (or consecutive images) can draw all of them without switching textures.  The 
+        atlas is a file ``name``.atlas, together with one or more PNG pages of the given 
+        size.  An atlas built ahead of time (with ``python -m kivy.atlas``) and kept in 
+        the **Images** folder is used if it is newer than all of the ``sources``.  
+        Otherwise the atlas is kept in the folder ``ATLAS_FOLDER``, which is the 
+        ``atlas`` folder of the user data folder of the game unless it is set.  If that 
+        file does not exist, or is older than one of the ``sources``, those images are 
+        packed into it first (with the Kivy atlas tool, which needs PIL).  Hence the 
+        images are only packed once, and the asset folders are never written to.
+        
+        Every image in the atlas is then put in the texture cache under its own file 
+        name, as a region of the atlas texture.  So :meth:`load_texture`, and every 
+        :class:`GImage` or :class:`GSprite` using one of these images, uses the atlas 
+        without any other change.  If the atlas cannot be built or loaded (for example,
+        because the atlas folder is read-only), the images are simply loaded one at a
+        time as before.  An image evicted from the texture cache is reloaded from its
+        own file, so pin the images that must stay in the atlas (see :meth:`pin_texture`)
+        or keep the budget above the atlas size.
+        
+        :param name: The atlas name (without the .atlas suffix)
+        :type name:  ``str``
+        
+        :param sources: The file names of the images to pack
+        :type sources:  ``list`` or ``tuple`` of ``str``
+        
+        :param size: The width and height of each atlas page
+        :type size:  ``int`` > 0
+        """
+        assert type(name) == str, '%s is not a valid atlas name' % repr(name)
+        assert all(map(cls.is_image,sources)), '%s are not all image files' % repr(sources)
+        if name in cls.ATLAS_CACHE:
+            return cls.ATLAS_CACHE[name]
+        
+        files = [os.path.join(cls.images,source) for source in sources]
+        def fresh(path):
+            if not os.path.exists(path+'.atlas'):
+                return False
+            stamp = os.path.getmtime(path+'.atlas')
+            return all(os.path.getmtime(f) <= stamp for f in files)
+        
+        try:
+            from kivy.atlas import Atlas
+            path = os.path.join(cls.images,name)
+            if not fresh(path):
+                folder = cls.ATLAS_FOLDER
+                if folder is None:
+                    import tempfile
+                    app = kivy.app.App.get_running_app()
+                    base = tempfile.gettempdir() if app is None else app.user_data_dir
+                    folder = os.path.join(base,'atlas')
+                os.makedirs(folder,exist_ok=True)
+                path = os.path.join(folder,name)
+                if not fresh(path):
+                    Atlas.create(path,files,size)
+            atlas = Atlas(path+'.atlas')
+        except:
+            print('Failed to load atlas',repr(name))
+            return None
+        
+        # The atlas names each region by its file name without the extension
+        for source in sources:
+            key = os.path.splitext(source)[0]
+            if key in atlas.textures:
+                cls._cache_texture(source,atlas.textures[key])
+        cls.ATLAS_CACHE[name] = atlas
+        return atlas
+    
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -220,6 +569,11 @@ class GameApp(kivy.app.App):
             
             GameApp(width=400,height=400)
         
+        To simulate the game at a fixed rate, independent of the ``fps``, provide the
+        ``timestep`` (and optionally ``max_steps``) as well::
+            
+            GameApp(width=400,height=400,fps=30,timestep=1/60.0)
+        
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
@@ -232,6 +586,8 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        t = keywords.pop('timestep', None)
+        m = keywords.pop('max_steps', 5)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -241,6 +597,9 @@ class GameApp(kivy.app.App):
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self._preloader = None
+        self.timestep  = t
+        self.max_steps = m
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
@@ -275,6 +634,75 @@ class GameApp(kivy.app.App):
         Clock.schedule_once(self._bootstrap,-1)
         kivy.app.App.run(self)
     
+    def preload(self,images=None,sounds=None,fonts=None,voices=1):
+        """
+        Starts loading the game assets in the background.
+        
+        The images (and the sounds, with a mixer) are decoded on a worker thread.  The 
+        rest of the work (such as uploading the textures) is done on the main thread, 
+        for ``PRELOAD_SLICE`` seconds at the start of each animation frame, so the game 
+        keeps animating while the assets load.  Without a mixer, Kivy can only open 
+        sounds and fonts on the main thread, so those are opened whole in these slices.
+        Use ``preload_progress`` to show how far along it is.
+        
+        The game can use an asset before it has been preloaded; it is then loaded on 
+        first use, as usual.  A preloaded image is put in the texture cache, and the 
+        preloaded copies of a sound are used as the voices of the first :class:`Sound` 
+        objects for that file.  Images already in the texture cache (such as the 
+        images in a texture atlas) are skipped.
+        
+        :param images: The images to load (None for every image in the **Images** folder)
+        :type images:  ``list`` of ``str`` or None
+        
+        :param sounds: The sounds to load (None for every sound in the **Sounds** folder)
+        :type sounds:  ``list`` of ``str`` or None
+        
+        :param fonts: The fonts to load (None for every font in the **Fonts** folder)
+        :type fonts:  ``list`` of ``str`` or None
+        
+        :param voices: The number of copies of each sound to load (the voices of Sound)
+        :type voices:  ``int`` > 0
+        """
+        from .preload import Preloader, asset_files
+        if images is None:
+            images = asset_files(self.images,('.png','.jpg','.jpeg','.gif'))
+        images = [name for name in images if not name in self.TEXTURE_CACHE]
+        if sounds is None:
+            sounds = asset_files(self.sounds,('.wav','.mp3','.ogg'))
+        if fonts is None:
+            fonts = asset_files(self.fonts,('.ttf',))
+        self._preloader = Preloader(images,sounds,fonts,voices)
+        self._preloader.start()
+    
+    def use_mixer(self,sink=None,voices=32):
+        """
+        Plays every :class:`Sound` created from now on through an in-process mixer.
+        
+        The mixer decodes each sound file once and mixes every voice that is playing
+        into a single output, instead of opening a Kivy audio stream for each voice.
+        Sounds created before this call keep using Kivy audio.
+        
+        By default the mixer plays to the sound card, which needs the optional package
+        ``sounddevice``.  Pass a ``NullSink`` to run the mixer without an audio device
+        (its ``pull`` method mixes the audio and measures the cost of mixing).
+        
+        :param sink: The output of the mixer (None for the sound card)
+        :type sink:  ``NullSink`` or ``DeviceSink`` or None
+        
+        :param voices: The number of voices that can play at once
+        :type voices:  ``int`` > 0
+        
+        :return: The new mixer
+        :rtype:  ``Mixer``
+        """
+        from .mixer import Mixer, DeviceSink
+        if not GameApp.MIXER is None:
+            GameApp.MIXER.close()
+        mixer = Mixer(self.sounds,voices=voices)
+        mixer.start(DeviceSink() if sink is None else sink)
+        GameApp.MIXER = mixer
+        return mixer
+    
     def stop(self):
         """
         Closes the game window and exit Python.
@@ -283,6 +711,8 @@ class GameApp(kivy.app.App):
         It should **never** be overridden.
         """
         import sys
+        if not GameApp.MIXER is None:
+            GameApp.MIXER.close()
         kivy.app.App.stop(self)
         sys.exit(0)
     
@@ -302,9 +732,9 @@ class GameApp(kivy.app.App):
         """
         Updates the state of the game one animation frame.
         
-        This method is called 60x a second (depending on the ``fps``) to provide on-screen 
-        animation. Any code that moves objects or processes user input (keyboard or mouse)
-        goes in this method.
+        This method is called 60x a second (depending on the ``fps``, or on the 
+        ``timestep`` if there is one) to provide on-screen animation. Any code that 
+        moves objects or processes user input (keyboard or mouse) goes in this method.
         
         Think of this method as the body of the loop.  You will need to add attributes
         that represent the current animation state, so that they can persist across
@@ -326,6 +756,41 @@ class GameApp(kivy.app.App):
     
     
     # HIDDEN METHODS
+    @classmethod
+    def _cache_texture(cls,name,texture):
+        """
+        Adds a texture to the texture cache, evicting textures to stay in the budget.
+        
+        The size of the texture is estimated from its dimensions and color format.  The 
+        least recently used textures are evicted first.  Pinned textures (and the new 
+        texture itself) are never evicted, so the cache may stay above the budget if 
+        every other texture is pinned.
+        
+        :param name: The file name
+        :type name:  ``str``
+        
+        :param texture: The texture to cache
+        :type texture:  ``kivy.graphics.texture.Texture``
+        """
+        depth = {'rgba': 4, 'bgra': 4, 'rgb': 3, 'bgr': 3, 'luminance_alpha': 2}
+        cls.TEXTURE_CACHE[name] = texture
+        cls.TEXTURE_CACHE.move_to_end(name)
+        cls.TEXTURE_SIZES[name] = texture.width*texture.height*depth.get(texture.colorfmt,1)
+        
+        if cls.TEXTURE_BUDGET is None:
+            return
+        total = sum(cls.TEXTURE_SIZES.values())
+        if total <= cls.TEXTURE_BUDGET:
+            return
+        pinned = set(cls.TEXTURE_PINS.values())
+        for key in list(cls.TEXTURE_CACHE):
+            if total <= cls.TEXTURE_BUDGET:
+                break
+            if key != name and not key in pinned:
+                total -= cls.TEXTURE_SIZES[key]
+                cls.unload_texture(key)
+                cls.TEXTURE_STATS['evictions'] += 1
+    
     def _bootstrap(self,dt):
         """
         Bootstraps the clock scheduler for the game..
@@ -346,11 +811,29 @@ class GameApp(kivy.app.App):
         This method a callback-proxy for the methods `update` and `draw`.  It handles
         important issues behind the scenes, particularly with clearing the window.
         
+        If there is a ``timestep``, `update` is called once for each full timestep of 
+        accumulated time (up to ``max_steps``), which may be zero times in a frame.
+        
+        If the game is preloading, a slice of the preloaded assets is finished first.
+        
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
+        if not self._preloader is None and not self._preloader.done:
+            self._preloader.step(self.PRELOAD_SLICE)
         self.view.clear()
-        self.update(dt)
+        if self._timestep is None:
+            self.update(dt)
+        else:
+            self._accumulator += dt
+            steps = 0
+            while self._accumulator >= self._timestep and steps < self._maxsteps:
+                self.update(self._timestep)
+                self._accumulator -= self._timestep
+                steps += 1
+            # Drop the time we could not catch up on
+            if self._accumulator >= self._timestep:
+                self._accumulator = self._accumulator % self._timestep
         self.draw()
     
     def _setpaths(self):
@@ -0,0 +1,274 @@
+"""
+Collision support for 2D games.
+
+This module provides exact rectangle (AABB) intersection tests, both for a single pair
+of rectangles and batched over NumPy arrays of rectangles.  It also provides a
+broadphase for collision detection.  A broadphase does not decide whether two objects
+collide.  It quickly rules out the pairs of objects that are too far apart to collide,
+so that only a few pairs need an exact test.
+
+Nothing in this module depends on Kivy.  Objects are described by their bounding boxes
+(left, bottom, right, top), so the module works equally well with :class:`GObject`
+instances and with plain simulation data.
+"""
+import numpy as np
+
+
+def aabb_overlap(a,b):
+    """
+    Checks whether two rectangles overlap.
+
+    Rectangles that only share an edge or a corner do not overlap.  Unlike a test of
+    the corners of one rectangle, this is exact no matter which rectangle is larger.
+
+    :param a: A rectangle as (left, bottom, right, top)
+    :type a:  4-element sequence of ``int`` or ``float``
+
+    :param b: A rectangle as (left, bottom, right, top)
+    :type b:  4-element sequence of ``int`` or ``float``
+
+    :return: True if ``a`` and ``b`` overlap; False otherwise
+    :rtype:  ``bool``
+    """
+    return a[0] < b[2] and a[2] > b[0] and a[1] < b[3] and a[3] > b[1]
+
+
+def aabb_overlaps(a,b):
+    """
+    Checks whether each rectangle in ``a`` overlaps the matching rectangle in ``b``.
+
+    This is :func:`aabb_overlap` applied element-by-element in a single NumPy operation.
+
+    :param a: The rectangles as rows of (left, bottom, right, top)
+    :type a:  array-like of shape (n,4)
+
+    :param b: The rectangles as rows of (left, bottom, right, top)
+    :type b:  array-like of shape (n,4)
+
+    :return: Whether ``a[i]`` overlaps ``b[i]``, for each i
+    :rtype:  ``numpy.ndarray`` of ``bool`` with shape (n,)
+    """
+    a = np.asarray(a,dtype=float).reshape(-1,4)
+    b = np.asarray(b,dtype=float).reshape(-1,4)
+    return (a[:,0] < b[:,2]) & (a[:,2] > b[:,0]) & (a[:,1] < b[:,3]) & (a[:,3] > b[:,1])
+
+
+def aabb_hits(a,b):
+    """
+    Finds every pair of overlapping rectangles between two batches.
+
+    Every rectangle in ``a`` is tested against every rectangle in ``b`` in a single
+    NumPy operation.  The pairs are returned in order of ``a``, then of ``b``.
+
+    :param a: The rectangles (e.g. the bolts) as rows of (left, bottom, right, top)
+    :type a:  array-like of shape (n,4)
+
+    :param b: The rectangles (e.g. the targets) as rows of (left, bottom, right, top)
+    :type b:  array-like of shape (m,4)
+
+    :return: The index arrays (i, j) such that ``a[i[k]]`` overlaps ``b[j[k]]``
+    :rtype:  ``tuple`` of two ``numpy.ndarray`` of ``int``
+    """
+    a = np.asarray(a,dtype=float).reshape(-1,1,4)
+    b = np.asarray(b,dtype=float).reshape(1,-1,4)
+    overlap = ((a[...,0] < b[...,2]) & (a[...,2] > b[...,0]) &
+               (a[...,1] < b[...,3]) & (a[...,3] > b[...,1]))
+    return np.nonzero(overlap)
+
+
+class SpatialHash(object):
+    """
+    A class representing a uniform grid broadphase.
+
+    The plane is divided into square cells of size ``cellsize``.  Each object is stored
+    (by key) in every cell touched by its bounding box.  To find the objects that might
+    overlap a rectangle, :meth:`query` only looks at the cells touched by that rectangle.
+
+    Keys can be any hashable value.  Objects that move should call :meth:`update`, which
+    does nothing unless the object actually changed cells.
+
+    The aliens of Alien Invaders sit on a regular lattice, so the game finds the column
+    a bolt can hit with arithmetic and tests that column with :func:`aabb_hits` instead.
+    This class is for targets that are scattered freely, where no such lookup exists.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def cellsize(self):
+        """
+        The width and height of a grid cell.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` or ``float`` > 0.
+        """
+        return self._cellsize
+
+
+    # BUILT-IN METHODS
+    def __init__(self,cellsize):
+        """
+        Creates a new, empty spatial hash.
+
+        For best results, the cell size should be about the size of the objects stored
+        in the hash.
+
+        :param cellsize: The width and height of a grid cell
+        :type cellsize:  ``int`` or ``float`` > 0
+        """
+        assert type(cellsize) in [int,float], '%s is not a number' % repr(cellsize)
+        assert cellsize > 0, '%s is not positive' % repr(cellsize)
+        self._cellsize = cellsize
+        self._cells = {}
+        self._ranges = {}
+
+    def __len__(self):
+        """
+        :return: The number of objects in this spatial hash.
+        :rtype:  ``int`` >= 0
+        """
+        return len(self._ranges)
+
+    def __contains__(self,key):
+        """
+        :return: True if ``key`` is in this spatial hash; False otherwise
+        :rtype:  ``bool``
+        """
+        return key in self._ranges
+
+
+    # PUBLIC METHODS
+    def insert(self,key,left,bottom,right,top):
+        """
+        Inserts an object with the given bounding box.
+
+        If the key is already in the hash, it is moved to the new bounding box.
+
+        :param key: The key identifying the object
+        :type key:  any hashable value
+
+        :param left: The left edge of the bounding box
+        :type left:  ``int`` or ``float``
+
+        :param bottom: The bottom edge of the bounding box
+        :type bottom:  ``int`` or ``float``
+
+        :param right: The right edge of the bounding box
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: The top edge of the bounding box
+        :type top:  ``int`` or ``float`` >= bottom
+        """
+        if key in self._ranges:
+            self.remove(key)
+        span = self._span(left,bottom,right,top)
+        self._ranges[key] = span
+        for cell in self._span_cells(span):
+            if cell in self._cells:
+                self._cells[cell].add(key)
+            else:
+                self._cells[cell] = {key}
+
+    def update(self,key,left,bottom,right,top):
+        """
+        Moves an object to the given bounding box.
+
+        This method only touches the grid if the object changed cells.  If the key is
+        not in the hash, it is inserted.
+
+        :param key: The key identifying the object
+        :type key:  any hashable value
+
+        :param left: The left edge of the bounding box
+        :type left:  ``int`` or ``float``
+
+        :param bottom: The bottom edge of the bounding box
+        :type bottom:  ``int`` or ``float``
+
+        :param right: The right edge of the bounding box
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: The top edge of the bounding box
+        :type top:  ``int`` or ``float`` >= bottom
+        """
+        if self._ranges.get(key) != self._span(left,bottom,right,top):
+            self.insert(key,left,bottom,right,top)
+
+    def remove(self,key):
+        """
+        Removes an object from this spatial hash.
+
+        Removing a key that is not in the hash does nothing.
+
+        :param key: The key identifying the object
+        :type key:  any hashable value
+        """
+        span = self._ranges.pop(key,None)
+        if span is None:
+            return
+        for cell in self._span_cells(span):
+            contents = self._cells[cell]
+            contents.discard(key)
+            if not contents:
+                del self._cells[cell]
+
+    def query(self,left,bottom,right,top):
+        """
+        Returns the keys of the objects that might overlap the given rectangle.
+
+        The result contains every object whose cells overlap the cells of the rectangle.
+        It may contain objects that do not actually overlap it, so each result still
+        needs an exact test.
+
+        :param left: The left edge of the rectangle
+        :type left:  ``int`` or ``float``
+
+        :param bottom: The bottom edge of the rectangle
+        :type bottom:  ``int`` or ``float``
+
+        :param right: The right edge of the rectangle
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: The top edge of the rectangle
+        :type top:  ``int`` or ``float`` >= bottom
+
+        :return: The keys of the objects near the rectangle
+        :rtype:  ``set``
+        """
+        result = set()
+        for cell in self._span_cells(self._span(left,bottom,right,top)):
+            contents = self._cells.get(cell)
+            if contents:
+                result.update(contents)
+        return result
+
+    def clear(self):
+        """
+        Removes every object from this spatial hash.
+        """
+        self._cells.clear()
+        self._ranges.clear()
+
+
+    # HIDDEN METHODS
+    def _span(self,left,bottom,right,top):
+        """
+        Returns the range of cells touched by a bounding box.
+
+        :return: The cell range as (first column, first row, last column, last row)
+        :rtype:  4-element ``tuple`` of ``int``
+        """
+        size = self._cellsize
+        return (int(left//size),int(bottom//size),int(right//size),int(top//size))
+
+    def _span_cells(self,span):
+        """
+        Returns the cells in a range of cells.
+
+        :param span: The cell range as (first column, first row, last column, last row)
+        :type span:  4-element ``tuple`` of ``int``
+
+        :return: The cells in the range
+        :rtype:  ``list`` of (``int``, ``int``)
+        """
+        return [(cx,cy) for cx in range(span[0],span[2]+1) for cy in range(span[1],span[3]+1)]
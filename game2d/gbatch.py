@@ -0,0 +1,289 @@
+"""
+A module to support batched sprite drawing.
+
+This module draws many copies of the same image with a single Kivy instruction.  Each
+copy (called a sprite) is a textured rectangle, and all of the rectangles share one
+vertex buffer in a single ``Mesh``.  This is much faster than a :class:`GImage` for each
+copy, as every :class:`GImage` has its own sequence of transform, color and rectangle
+instructions.
+"""
+# Kivy is imported where it is used, so that importing this module does not load it
+import numpy as np
+from .gobject import GObject
+
+# #mark -
+class GSpriteBatch(GObject):
+    """
+    A class representing many copies of an image drawn as one shape.
+
+    The image is given by a JPEG, PNG, or GIF file whose name is stored in the attribute
+    `source`.  Each sprite in the batch is a rectangle of size ``width`` by ``height``
+    showing that image (or a region of it).  The sprites are positioned relative to the
+    point (x,y) of the batch, so moving the batch moves every sprite at once.
+
+    Sprites are added with :meth:`add`, which returns the index of the new sprite, or
+    many at once with :meth:`add_many`.  Sprites can be moved one at a time with
+    :meth:`move`, or all at once with :meth:`update`.  A sprite that is hidden is simply
+    left out of the mesh, so it costs nothing to draw.
+
+    Every move rebuilds the vertex data of the mesh (with NumPy), so to move many
+    sprites, use a single call to :meth:`update` instead of many calls to :meth:`move`.
+    In the same way, use :meth:`add_many` instead of many calls to :meth:`add`.  Hiding
+    or showing a sprite only rebuilds the triangle indices.
+    As Kivy meshes use 16 bit indices, a batch can hold at most 16384 sprites.
+
+    If you define ``fillcolor``, this object will tint every sprite by the given color.
+    The method :meth:`contains` treats this shape as a single rectangle of size ``width``
+    by ``height`` centered at (x,y), not as the union of its sprites.
+    """
+
+    # The largest number of sprites that fits in 16 bit indices
+    MAX_SPRITES = 16384
+
+    # MUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for the sprite image.
+
+        **invariant**. Value be a string refering to a valid file.
+        """
+        return self._source
+
+    @source.setter
+    def source(self,value):
+        from .app import GameApp
+        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        self._source = value
+        if self._defined:
+            self._reset()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def count(self):
+        """
+        The number of sprites in this batch (including hidden ones)
+
+        **invariant**. Value is an int >= 0.
+        """
+        return self._count
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new, empty sprite batch.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes. For example, to draw
+        copies of ``alien1.png`` that are 30 pixels wide and 40 pixels high, use the
+        constructor::
+
+            GSpriteBatch(x=0,y=0,width=30,height=40,source='alien1.png')
+
+        This class supports the all same keywords as :class:`GObject`; the only new
+        keyword is ``source``.  The attributes ``width`` and ``height`` are the size
+        of each sprite.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self.source = keywords['source'] if 'source' in keywords else None
+        self._texture = None
+        self._mesh = None
+        self._count = 0
+        self._pos = np.zeros((0,2))
+        self._coords = np.zeros((0,8))
+        self._visible = np.zeros(0,dtype=bool)
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # PUBLIC METHODS
+    def add(self,x,y,region=None):
+        """
+        Adds a sprite to this batch.
+
+        By default, the sprite shows the whole image.  To show part of it instead (such
+        as a frame of a filmstrip), give a texture region of the image.  The region may
+        also be any other region of the same texture, such as another image packed into
+        the same atlas (see the method ``load_atlas`` in :class:`GameApp`).
+
+        :param x: the horizontal coordinate of the sprite center, relative to the batch
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate of the sprite center, relative to the batch
+        :type y:  ``int`` or ``float``
+
+        :param region: the part of the texture to show
+        :type region:  a Kivy ``TextureRegion`` of the image texture, or None
+
+        :return: The index of the new sprite
+        :rtype:  ``int``
+        """
+        assert type(x) in [int,float], '%s is not a number' % repr(x)
+        assert type(y) in [int,float], '%s is not a number' % repr(y)
+        return self.add_many([x],[y],[region])[0]
+
+    def add_many(self,xs,ys,regions=None):
+        """
+        Adds many sprites to this batch at once.
+
+        This is the same as calling :meth:`add` for each sprite, except that the mesh is
+        only rebuilt once.
+
+        :param xs: the horizontal coordinates of the sprite centers, relative to the batch
+        :type xs:  array-like of numbers
+
+        :param ys: the vertical coordinates of the sprite centers, relative to the batch
+        :type ys:  array-like of numbers (the same length as ``xs``)
+
+        :param regions: the part of the texture each sprite shows (None for all of it)
+        :type regions:  ``list`` of Kivy ``TextureRegion`` or None, or None
+
+        :return: The indices of the new sprites
+        :rtype:  ``list`` of ``int``
+        """
+        pos = np.column_stack((np.asarray(xs,dtype=float),np.asarray(ys,dtype=float)))
+        n = len(pos)
+        assert regions is None or len(regions) == n, '%s is the wrong length' % repr(regions)
+        assert self._count+n <= self.MAX_SPRITES, 'batch %s is full' % repr(self)
+        whole = self._texture.tex_coords if self._texture else (0,0,1,0,1,1,0,1)
+        if regions is None:
+            coords = [whole]*n
+        else:
+            coords = [whole if region is None else region.tex_coords for region in regions]
+        self._pos = np.vstack((self._pos,pos))
+        self._coords = np.vstack((self._coords,np.reshape(coords,(n,8))))
+        self._visible = np.append(self._visible,np.ones(n,dtype=bool))
+        self._count += n
+        self._rebuild(True,True)
+        return list(range(self._count-n,self._count))
+
+    def move(self,index,x,y):
+        """
+        Moves a sprite in this batch.
+
+        :param index: the index of the sprite
+        :type index:  ``int`` in 0..count-1
+
+        :param x: the horizontal coordinate of the sprite center, relative to the batch
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate of the sprite center, relative to the batch
+        :type y:  ``int`` or ``float``
+        """
+        assert type(x) in [int,float], '%s is not a number' % repr(x)
+        assert type(y) in [int,float], '%s is not a number' % repr(y)
+        self._pos[index] = (x,y)
+        self._rebuild(True,False)
+
+    def update(self,xs,ys):
+        """
+        Moves every sprite in this batch at once.
+
+        :param xs: the horizontal coordinates of the sprite centers, relative to the batch
+        :type xs:  array-like of ``count`` numbers
+
+        :param ys: the vertical coordinates of the sprite centers, relative to the batch
+        :type ys:  array-like of ``count`` numbers
+        """
+        self._pos[:,0] = xs
+        self._pos[:,1] = ys
+        self._rebuild(True,False)
+
+    def hide(self,index):
+        """
+        Hides a sprite in this batch.
+
+        :param index: the index of the sprite
+        :type index:  ``int`` in 0..count-1
+        """
+        if self._visible[index]:
+            self._visible[index] = False
+            self._rebuild(False,True)
+
+    def show(self,index):
+        """
+        Shows a hidden sprite in this batch.
+
+        :param index: the index of the sprite
+        :type index:  ``int`` in 0..count-1
+        """
+        if not self._visible[index]:
+            self._visible[index] = True
+            self._rebuild(False,True)
+
+    def is_visible(self,index):
+        """
+        :param index: the index of the sprite
+        :type index:  ``int`` in 0..count-1
+
+        :return: True if the sprite is shown; False if it is hidden
+        :rtype:  ``bool``
+        """
+        return bool(self._visible[index])
+
+
+    # HIDDEN METHODS
+    def _vertices(self):
+        """
+        :return: The vertex data of the sprites, as (x, y, u, v) for each corner
+        :rtype:  ``list`` of ``float``
+        """
+        w = self.width/2.0
+        h = self.height/2.0
+        x = self._pos[:,0:1]
+        y = self._pos[:,1:2]
+        # The corners go bottom left, bottom right, top right, top left
+        xs = np.hstack((x-w,x+w,x+w,x-w))
+        ys = np.hstack((y-h,y-h,y+h,y+h))
+        data = np.stack((xs,ys,self._coords[:,0::2],self._coords[:,1::2]),axis=2)
+        return data.ravel().tolist()
+
+    def _indices(self):
+        """
+        :return: The triangle indices of the visible sprites
+        :rtype:  ``list`` of ``int``
+        """
+        base = 4*np.flatnonzero(self._visible)
+        quads = base[:,None] + np.array([0,1,2,0,2,3])
+        return quads.ravel().tolist()
+
+    def _rebuild(self,vertices,indices):
+        """
+        Updates the mesh after a change to the sprites
+
+        :param vertices: whether the sprites were added or moved
+        :type vertices:  ``bool``
+
+        :param indices: whether the sprites were added, hidden or shown
+        :type indices:  ``bool``
+        """
+        if self._mesh is None:
+            return
+        if vertices:
+            self._mesh.vertices = self._vertices()
+        if indices:
+            self._mesh.indices = self._indices()
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        from kivy.graphics import Mesh, Color, PopMatrix
+        from .app import GameApp
+        GObject._reset(self)
+        self._texture = GameApp.load_texture(self.source) if self.source else None
+        GameApp.pin_texture(self,self.source)
+        self._mesh = Mesh(vertices=self._vertices(),indices=self._indices(),
+                          mode='triangles',texture=self._texture)
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
+        else:
+            self._cache.add(Color(1,1,1))
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
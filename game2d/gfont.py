@@ -0,0 +1,399 @@
+"""
+A module to support bitmap font text.
+
+A :class:`GLabel` renders each string it shows into a texture of its own.  That is the
+right choice for text that rarely changes, but text that changes all the time (such as
+a score, a timer or a frame rate counter) renders a new texture for every new string.
+
+This module renders each glyph (character) of a font only once, into a single texture
+called a glyph atlas.  A :class:`GBitmapLabel` draws its text as one textured rectangle
+per character, all in a single ``Mesh`` that uses the glyph atlas.  Changing the text
+only changes the vertex data of that mesh.
+"""
+import numpy as np
+from .gobject import GObject
+
+
+# #mark -
+class GlyphAtlas(object):
+    """
+    A class representing the glyphs of one font at one size, packed into a texture.
+
+    Each glyph is rendered once (in white, so that it can be drawn in any color) and
+    packed into rows of a single texture.  The atlas knows the texture coordinates and
+    the width of each glyph.  As each glyph has a fixed width, text is spaced a little
+    differently than in a :class:`GLabel` (there is no kerning).
+
+    You should not create these yourself.  Use the method ``load_glyphs`` in
+    :class:`GameApp`, which shares one atlas between all text in the same font and size.
+    """
+
+    # The characters in an atlas unless another set is given (printable ASCII)
+    CHARSET = ''.join(map(chr,range(32,127)))
+
+    # The pixels left between glyphs, so that filtering does not bleed between them
+    PADDING = 1
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def font_name(self):
+        """
+        The name of the font of this atlas.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a string.
+        """
+        return self._font_name
+
+    @property
+    def font_size(self):
+        """
+        The size of the font of this atlas, in points.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._font_size
+
+    @property
+    def texture(self):
+        """
+        The texture that the glyphs are packed into.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a Kivy ``Texture``.
+        """
+        return self._texture
+
+    @property
+    def line_height(self):
+        """
+        The height of a line of text.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._line_height
+
+
+    # BUILT-IN METHODS
+    def __init__(self,font_name,font_size,charset=CHARSET):
+        """
+        Renders the glyphs of a font into a new atlas.
+
+        :param font_name: The font name, or the file name of a font in the **Fonts** folder
+        :type font_name:  ``str``
+
+        :param font_size: The size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+
+        :param charset: The characters to render
+        :type charset:  ``str``
+        """
+        from kivy.core.text import Label as CoreLabel
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, Rectangle
+        self._font_name = font_name
+        self._font_size = font_size
+
+        # Render each glyph on its own
+        rendered = []
+        for char in sorted(set(charset)):
+            label = CoreLabel(text=char,font_name=font_name,font_size=font_size)
+            label.refresh()
+            if label.texture is None:
+                width, height = label.get_extents(char)
+            else:
+                width, height = label.texture.size
+            rendered.append((char,width,height,label.texture))
+        self._line_height = max([item[2] for item in rendered]+[0])
+
+        # Pack the glyphs in rows, in a texture that is wide enough for about 16 glyphs
+        pad = self.PADDING
+        widest = max([item[1] for item in rendered]+[1])
+        size = 64
+        while size < 16*(widest+pad):
+            size *= 2
+        places = []
+        x = pad
+        y = pad
+        for char, width, height, texture in rendered:
+            if x+width+pad > size:
+                x = pad
+                y += self._line_height+pad
+            places.append((x,y))
+            x += width+pad
+        rows = y+self._line_height+pad
+        height = 64
+        while height < rows:
+            height *= 2
+
+        # Draw the glyphs into the atlas texture
+        self._fbo = Fbo(size=(size,height))
+        self._fbo.add(ClearColor(0,0,0,0))
+        self._fbo.add(ClearBuffers())
+        self._fbo.add(Color(1,1,1,1))
+        self._glyphs = {}
+        for (char, width, gheight, texture), (x, y) in zip(rendered,places):
+            if not texture is None and width > 0:
+                self._fbo.add(Rectangle(pos=(x,y),size=texture.size,texture=texture))
+            # The texture coordinates go bottom left, bottom right, top right, top left
+            u0, v0 = x/size, y/height
+            u1, v1 = (x+width)/size, (y+gheight)/height
+            self._glyphs[char] = (width,gheight,(u0,v0,u1,v0,u1,v1,u0,v1))
+        self._fbo.draw()
+        self._texture = self._fbo.texture
+
+
+    # PUBLIC METHODS
+    def glyph(self,char):
+        """
+        Returns: The size and texture coordinates of a glyph
+
+        A character that is not in this atlas is drawn as a '?' (or as nothing, if
+        there is no '?' in this atlas either).
+
+        :param char: The character
+        :type char:  ``str`` of length 1
+
+        :return: The width, the height and the 8 texture coordinates of the glyph
+        :rtype:  ``tuple`` or None
+        """
+        result = self._glyphs.get(char)
+        if result is None:
+            result = self._glyphs.get('?')
+        return result
+
+
+# #mark -
+class GBitmapLabel(GObject):
+    """
+    A class representing an (uneditable) text label drawn from a glyph atlas.
+
+    This object is like a :class:`GLabel` without a background or border.  The text is
+    drawn in ``linecolor`` (black by default), and lines are separated by '\\n' and
+    aligned according to ``halign``.  The glyphs come from a :class:`GlyphAtlas` for
+    the font and size, which is shared with every other bitmap label using them.  So
+    changing the text never renders anything; it only moves the rectangles of the
+    characters.
+
+    The attributes ``width`` and ``height`` are present in this object, but they are
+    read-only.  They are the size of the text, which is centered at (x,y).  Fonts are
+    referred to as in :class:`GLabel`: by the file name of a .ttf file in the **Fonts**
+    folder, or not at all for the default Kivy font.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def text(self):
+        """
+        The text for this label.
+
+        Assigning the text this label already has does nothing.
+
+        **Invariant**: Must be a string"""
+        return self._text
+
+    @text.setter
+    def text(self,value):
+        assert type(value) == str, 'value %s is not a string' % repr(value)
+        if value != self._text:
+            self._text = value
+            if self._defined:
+                self._layout()
+
+    @property
+    def halign(self):
+        """
+        The horizontal alignment of the lines of this label.
+
+        **Invariant**: Must be one of 'left', 'right', or 'center'"""
+        return self._halign
+
+    @halign.setter
+    def halign(self,value):
+        assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
+        self._halign = value
+        if self._defined:
+            self._layout()
+
+    @property
+    def font_size(self):
+        """
+        The size of the text font in points.
+
+        Changing the size switches to the glyph atlas for the new size (rendering it if
+        no other label uses that size yet).
+
+        **Invariant**: Must be a positive number (int or float)"""
+        return self._fsize
+
+    @font_size.setter
+    def font_size(self,value):
+        assert type(value) in [int,float] and value > 0, 'value %s is not a valid size' % repr(value)
+        self._fsize = value
+        if self._defined:
+            self._reset()
+
+    @property
+    def font_name(self):
+        """
+        The file name for the .ttf file to use as a font
+
+        **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
+        return self._fname
+
+    @font_name.setter
+    def font_name(self,value):
+        from .app import GameApp
+        assert GameApp.is_font(value), 'value %s is not a font name' % repr(value)
+        self._fname = value
+        if self._defined:
+            self._reset()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def width(self):
+        """
+        The horizontal width of the text.
+
+        **invariant**: Value must be an ``int`` or ``float`` > 0
+        """
+        return self._width
+
+    @property
+    def height(self):
+        """
+        The vertical height of the text.
+
+        **invariant**: Value must be an ``int`` or ``float`` > 0
+        """
+        return self._height
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new bitmap text label.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes.  For example, to show a
+        score in the font ``RetroGame.ttf``, use the constructor call::
+
+            GBitmapLabel(text='Score: 0',font_name='RetroGame.ttf',font_size=25)
+
+        This class supports the same keywords as :class:`GObject` (except for ``width``
+        and ``height``), as well as ``text``, ``halign``, ``font_size`` and ``font_name``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        from kivy.core.text import DEFAULT_FONT
+        from kivy.metrics import sp
+        self._defined = False
+        self._atlas = None
+        self._mesh = None
+        self._width = 1.0
+        self._height = 1.0
+        self._text = ''
+        self._fsize = sp(15)
+        self._fname = DEFAULT_FONT
+        if 'font_size' in keywords:
+            self.font_size = keywords['font_size']
+        if 'font_name' in keywords:
+            self.font_name = keywords['font_name']
+        self.text = keywords['text'] if 'text' in keywords else ''
+        self.halign = keywords['halign'] if 'halign' in keywords else 'center'
+        GObject.__init__(self,**keywords)
+        if not self.linecolor:
+            self.linecolor = (0,0,0,1)
+        self._reset()
+        self._defined = True
+
+    def __str__(self):
+        """
+        :return: A readable string representation of this object.
+        :rtype:  ``str``
+        """
+        if self.name is None:
+            s = '['
+        else:
+            s = '[name=%s,' % self.name
+        return '%s,text=%s,center=(%s,%s),angle=%s]' \
+                % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
+
+
+    # HIDDEN METHODS
+    def _vertices(self):
+        """
+        Lays out the text, updating the width and height of this label.
+
+        :return: The vertex data of the characters, as (x, y, u, v) for each corner
+        :rtype:  ``list`` of ``float``
+        """
+        lines = self._text.split('\n')
+        lh = self._atlas.line_height
+        glyphs = []
+        widths = []
+        for line in lines:
+            row = [glyph for glyph in map(self._atlas.glyph,line) if not glyph is None]
+            glyphs.append(row)
+            widths.append(sum(glyph[0] for glyph in row))
+        self._width  = float(max(max(widths),1))
+        self._height = float(max(lh*len(lines),1))
+
+        corners = []
+        coords = []
+        top = self._height/2.0
+        for row, width in zip(glyphs,widths):
+            top -= lh
+            if self._halign == 'left':
+                pen = -self._width/2.0
+            elif self._halign == 'right':
+                pen = self._width/2.0-width
+            else:
+                pen = -width/2.0
+            for gw, gh, tex in row:
+                corners.append((pen,top,pen+gw,top+gh))
+                coords.append(tex)
+                pen += gw
+        if not corners:
+            return []
+
+        # The corners go bottom left, bottom right, top right, top left
+        box = np.array(corners,dtype=float)
+        xs = box[:,[0,2,2,0]]
+        ys = box[:,[1,1,3,3]]
+        uv = np.array(coords,dtype=float)
+        data = np.stack((xs,ys,uv[:,0::2],uv[:,1::2]),axis=2)
+        return data.ravel().tolist()
+
+    def _layout(self):
+        """
+        Updates the mesh after a change to the text.
+
+        Only the vertex data of the mesh changes; no instructions are rebuilt.
+        """
+        vertices = self._vertices()
+        quads = len(vertices)//16
+        indices = (4*np.arange(quads)[:,None]+np.array([0,1,2,0,2,3])).ravel().tolist()
+        self._mesh.vertices = vertices
+        self._mesh.indices = indices
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        from kivy.graphics import Mesh, PopMatrix
+        from .app import GameApp
+        GObject._reset(self)
+        self._atlas = GameApp.load_glyphs(self._fname,self._fsize)
+        self._mesh = Mesh(mode='triangles',texture=self._atlas.texture)
+        self._layout()
+        self._cache.add(self._linecolor)
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
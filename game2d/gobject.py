@@ -8,9 +8,8 @@ These classes will not work unless you adhere to proper subclassing practices.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from introcs.geom import Point2, Matrix
+# Kivy and introcs are imported where they are used, so that importing this module
+# (for example, to subclass GObject) does not load them.
 
 def is_color(c):
     """
@@ -230,6 +229,7 @@ class GObject(object):
     @linecolor.setter
     def linecolor(self,value):
         import introcs
+        from kivy.graphics import Color
         assert value is None or is_color(value), '%s is not a valid color' % repr(value)
         if type(value) in [tuple, list] and len(value) == 3:
             value = list(value)+[1.0]
@@ -268,6 +268,7 @@ class GObject(object):
     @fillcolor.setter
     def fillcolor(self,value):
         import introcs
+        from kivy.graphics import Color
         assert value is None or is_color(value), '%s is not a valid color' % repr(value)
         if type(value) in [tuple, list] and len(value) == 3:
             value = list(value)+[1.0]
@@ -478,8 +479,10 @@ class GObject(object):
         """
         # Set the properties.
         self._defined = False
+        self._slot = None
 
         # Create the Kivy transforms for position and size
+        from kivy.graphics import Translate, Rotate, Scale
         self._trans  = Translate(0,0,0)
         self._rotate = Rotate(angle=0,axis=(0,0,1))
         self._scale  = Scale(1,1,1)
@@ -552,6 +555,7 @@ class GObject(object):
         :return: True if the shape contains this point
         :rtype:  ``bool``
         """
+        from introcs.geom import Point2
         if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
@@ -577,6 +581,7 @@ class GObject(object):
         :return: The point transformed to local coordinate system
         :rtype:  :class:`Point2`
         """
+        from introcs.geom import Point2
         if isinstance(point,Point2):
             return self.inverse.transform(point)
         else:
@@ -598,12 +603,55 @@ class GObject(object):
         except:
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
 
+    def attach(self, view, layer=0):
+        """
+        Attaches this shape to the provided view in retained mode.
+
+        An attached shape is drawn every animation frame until it is detached, so there
+        is no need to call :meth:`draw`.  Changing the shape (even in a way that rebuilds
+        its drawing cache) updates the view automatically.  Attaching a shape that is
+        already attached does nothing.
+
+        Shapes in a higher layer are drawn on top of shapes in a lower layer.  Within a
+        layer, shapes are drawn in the order they were attached.
+
+        :param view: view to attach to
+        :type view:  :class:`GView`
+
+        :param layer: the layer to draw in
+        :type layer:  ``int``
+        """
+        if self._slot is None:
+            from kivy.graphics import InstructionGroup
+            self._slot = InstructionGroup()
+            self._slot.add(self._cache)
+        view.attach(self._slot,layer)
+
+    def detach(self, view):
+        """
+        Detaches this shape from the provided view.
+
+        Detaching a shape that is not attached does nothing.
+
+        :param view: view to detach from
+        :type view:  :class:`GView`
+        """
+        if not self._slot is None:
+            view.detach(self._slot)
+
     # HIDDEN METHODS
     def _reset(self):
         """
         Resets the drawing cache.
+
+        If this shape has been attached to a view, the new cache replaces the old one
+        in the view.
         """
+        from kivy.graphics import InstructionGroup, PushMatrix
         self._cache = InstructionGroup()
+        if not self._slot is None:
+            self._slot.clear()
+            self._slot.add(self._cache)
         self._cache.add(PushMatrix())
         self._cache.add(self._trans)
         self._cache.add(self._rotate)
@@ -613,6 +661,7 @@ class GObject(object):
         """
         Builds the transform matrices after a settings change.
         """
+        from introcs.geom import Matrix
         self._matrix = Matrix()
         self._matrix.translate(self._trans.x,self._trans.y)
         self._matrix.rotate(self._rotate.angle)
@@ -759,6 +808,7 @@ class GScene(GObject):
         """
         Resets the drawing cache
         """
+        from kivy.graphics import PopMatrix
         GObject._reset(self)
         for x in self.children:
             self._cache.add(x._cache)
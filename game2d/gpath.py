@@ -7,9 +7,7 @@ and paths (e.g. lines with width).
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-# Lower-level kivy modules to support animation
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+# Lower-level kivy modules are imported where they are used, to import this module fast
 from .gobject import GObject
 
 
@@ -254,6 +252,7 @@ class GPath(GObject):
         """
         Resets the drawing cache
         """
+        from kivy.graphics import Line, PopMatrix
         GObject._reset(self)
         if not self._linecolor is None:
             self._cache.add(self._linecolor)
@@ -353,6 +352,7 @@ class GTriangle(GPath):
         """
         Resets the drawing cache
         """
+        from kivy.graphics import Line, Mesh, PopMatrix
         GObject._reset(self)
         
         vertices = ()
@@ -544,6 +544,7 @@ class GPolygon(GPath):
         """
         Creates the mesh for this polygon
         """
+        from kivy.graphics import Mesh
         size = len(self.points)/2
         try:
             texture = Image(source=self.source).texture
@@ -575,6 +576,7 @@ class GPolygon(GPath):
         """
         Resets the drawing cache
         """
+        from kivy.graphics import Line, PopMatrix
         GObject._reset(self)
         self._make_mesh()
         
@@ -8,12 +8,8 @@ to draw shapes.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.uix.label import Label
-from kivy.uix.image import Image
+# Kivy is imported where it is used, so that importing this module does not load it
 from .gobject import GObject
-from .app import GameApp
 
 class GRectangle(GObject):
     """
@@ -80,6 +76,7 @@ class GRectangle(GObject):
         """
         Resets the drawing cache
         """
+        from kivy.graphics import Rectangle, Line, PopMatrix
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
@@ -166,6 +163,7 @@ class GEllipse(GRectangle):
         """
         Resets the drawing cache.
         """
+        from kivy.graphics import Ellipse, Line, PopMatrix
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
@@ -217,6 +215,7 @@ class GImage(GRectangle):
 
     @source.setter
     def source(self,value):
+        from .app import GameApp
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
         self._source = value
         if self._defined:
@@ -253,11 +252,14 @@ class GImage(GRectangle):
         """
         Resets the drawing cache.
         """
+        from kivy.graphics import Rectangle, Color, Line, PopMatrix
+        from .app import GameApp
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
         
         self._texture = GameApp.load_texture(self.source)
+        GameApp.pin_texture(self,self.source)
         fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
         if not self._fillcolor is None:
             self._cache.add(self._fillcolor)
@@ -296,7 +298,30 @@ class GLabel(GRectangle):
     to the font by filename, including the .ttf. If you give no name, it will use the 
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
-    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
+    
+    The text is rendered to a texture, which is shared by every label with the same 
+    text, font, size, color and alignment (see the method ``render_text`` in 
+    :class:`GameApp`).  Changing the text to something already rendered reuses that
+    texture, and assigning the text the label already has does nothing at all.
+    
+    The other text keywords of a Kivy Label (those in ``TEXT_OPTIONS``, such as 
+    `italic`, `markup`, `padding` or `text_size`) can be given to the constructor.  
+    They are part of the key of the rendered texture, but they cannot be changed 
+    afterwards.  Any other keyword is an error."""
+    
+    # The keywords of a Kivy Label that are passed on to render the text
+    TEXT_OPTIONS = ('italic','underline','strikethrough','markup','padding','padding_x',
+                    'padding_y','text_size','line_height','max_lines','shorten',
+                    'shorten_from','split_str','strip','unicode_errors','font_family',
+                    'font_context','font_features','font_hinting','font_kerning',
+                    'font_blended','font_direction','font_script_name','base_direction',
+                    'text_language','outline_width','outline_color','mipmap')
+    
+    # The keywords that set attributes of this object instead
+    ATTRIBUTES = ('x','y','left','right','top','bottom','width','height','angle',
+                  'fillcolor','linecolor','linewidth','name','text','font_size',
+                  'font_name','bold','halign','valign')
     
     # MUTABLE PROPERTIES
     @property
@@ -310,9 +335,10 @@ class GLabel(GRectangle):
     @font_size.setter
     def font_size(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
-        self._fsize = value
-        self._label.font_size = value
-        self._label.texture_update()
+        if value != self._fsize:
+            self._fsize = value
+            if self._defined:
+                self._reset()
     
     @property
     def font_name(self):
@@ -320,14 +346,16 @@ class GLabel(GRectangle):
         The file name for the .ttf file to use as a font
         
         **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
-        return self._label.font_name
+        return self._fname
     
     @font_name.setter
     def font_name(self,value):
         from .app import GameApp
         assert GameApp.is_font(value), 'value %s is not a font name' % repr(value)
-        self._label.font_name = value
-        self._label.texture_update()
+        if value != self._fname:
+            self._fname = value
+            if self._defined:
+                self._reset()
     
     @property
     def bold(self):
@@ -339,13 +367,15 @@ class GLabel(GRectangle):
         `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
         
         **Invariant**: Must be a boolean"""
-        return self._label.bold
+        return self._bold
 
     @bold.setter
     def bold(self,value):
         assert type(value) == bool, repr(value)+' is not a bool'
-        self._label.bold = value
-        self._label.texture_update()
+        if value != self._bold:
+            self._bold = value
+            if self._defined:
+                self._reset()
 
     @property
     def text(self):
@@ -357,13 +387,15 @@ class GLabel(GRectangle):
         this label will grow to ensure that the text will fit in the rectangle.
         
         **Invariant**: Must be a string"""
-        return self._label.text
+        return self._text
     
     @text.setter
     def text(self,value):
         assert type(value) == str, 'value %s is not a string' % repr(value)
-        self._label.text = value
-        self._label.texture_update()
+        if value != self._text:
+            self._text = value
+            if self._defined:
+                self._reset()
     
     @property
     def halign(self):
@@ -385,7 +417,6 @@ class GLabel(GRectangle):
     def halign(self,value):
         assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
         self._halign = value
-        self._label.halign = value
         if self._defined:
             self._reset()
     
@@ -409,7 +440,6 @@ class GLabel(GRectangle):
     def valign(self,value):
         assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % repr(value)
         self._valign = value
-        self._label.valign = value
         if self._defined:
             self._reset()
     
@@ -588,20 +618,36 @@ class GLabel(GRectangle):
             GLabel(text='Hello')
         
         This class supports the all same keywords as :class:`GRectangle`, as well as 
-        additional attributes for the text properties (e.g. font size and name).
-        """
+        additional attributes for the text properties (e.g. font size and name), and 
+        the keywords in ``TEXT_OPTIONS``.
+        """
+        from kivy.core.text import DEFAULT_FONT
+        from kivy.metrics import sp
+        options = {}
+        for key, value in keywords.items():
+            if key in self.TEXT_OPTIONS:
+                options[key] = tuple(value) if type(value) == list else value
+            else:
+                assert key in self.ATTRIBUTES, '%s is not a GLabel keyword' % repr(key)
+        self._options = tuple(sorted(options.items()))
         self._defined = False
         self._hanchor = 'center'
         self._vanchor = 'center'
+        self._texture = None
         
-        sanitized = {}
-        excludes  = ['linewidth','linecolor','fillcolor','halign','valign','left','bottom']
-        for key in keywords:
-            if not key in excludes:
-                sanitized[key] = keywords[key]
-        
-        self._label = Label(**sanitized)
-        self._label.size_hint = (None,None)
+        # The defaults are those of a Kivy Label
+        self._text  = ''
+        self._fsize = sp(15)
+        self._fname = DEFAULT_FONT
+        self._bold  = False
+        if 'text' in keywords:
+            self.text = keywords['text']
+        if 'font_size' in keywords:
+            self.font_size = keywords['font_size']
+        if 'font_name' in keywords:
+            self.font_name = keywords['font_name']
+        if 'bold' in keywords:
+            self.bold = keywords['bold']
         
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         self.halign = keywords['halign'] if 'halign' in keywords else 'center'
@@ -612,7 +658,6 @@ class GLabel(GRectangle):
             self.linecolor = (0,0,0,1)
         self._reset()
         self._defined = True
-        self._label.bind(texture_size=self._callback)
     
     def __str__(self):
         """
@@ -627,27 +672,22 @@ class GLabel(GRectangle):
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
     # HIDDEN METHODS
-    def _callback(self,instance=None,value=None):
-        """
-        A workaround to deal with parameter requirements for callbacks
-        """
-        if self._defined:
-            self._reset()
-    
     def _reset(self):
         """
         Resets the drawing cache.
         """
-        # Set up the label at the center.
-        self._label.size = self._label.texture_size
-        self._label.center = (0,0)
-        if self.linecolor:
-            self._label.color = self.linecolor
+        from kivy.graphics import Rectangle, Color, Line, PopMatrix
+        from .app import GameApp
+        # Get the text texture (rendering it only if it is not cached)
+        color = tuple(self.linecolor) if self.linecolor else (0,0,0,1)
+        self._texture = GameApp.render_text(self._text,self._fname,self._fsize,
+                                            self._bold,color,self._halign,self._options)
+        tw, th = (0,0) if self._texture is None else self._texture.size
         
         # Resize the outside if necessary
         self._defined = False
-        self.width  = max(self.width, self._label.width)
-        self.height = max(self.height,self._label.height)
+        self.width  = max(self.width, tw)
+        self.height = max(self.height,th)
         self._defined = True
         
         # Reset the absolute anchor
@@ -663,16 +703,18 @@ class GLabel(GRectangle):
             self._trans.y = self._hv+self.height/2.0
         
         # Reset the label anchor.
+        tx = -tw/2.0
         if self.halign == 'left':
-            self._label.x = -self.width/2.0
+            tx = -self.width/2.0
         elif self.halign == 'right':
-            self._label.right = self.width/2.0
+            tx = self.width/2.0-tw
         
         # Reset the label anchor.
+        ty = -th/2.0
         if self.valign == 'top':
-            self._label.top = self.height/2.0
+            ty = self.height/2.0-th
         elif self.valign == 'bottom':
-            self._label.bottom = -self.height/2.0
+            ty = -self.height/2.0
         
         GObject._reset(self)
         x = -self.width/2.0
@@ -683,7 +725,9 @@ class GLabel(GRectangle):
             self._cache.add(self._fillcolor)
             self._cache.add(fill)
         
-        self._cache.add(self._label.canvas)
+        if not self._texture is None:
+            self._cache.add(Color(1,1,1))
+            self._cache.add(Rectangle(pos=(tx,ty),size=(tw,th),texture=self._texture))
         
         if self._linewidth > 0:
             line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
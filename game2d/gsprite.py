@@ -9,10 +9,8 @@ by changing the current frame.
 Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+# Kivy is imported where it is used, so that importing this module does not load it
 from .grectangle import GRectangle, GObject
-from .app import GameApp
 
 # #mark -
 class GSprite(GRectangle):
@@ -47,6 +45,7 @@ class GSprite(GRectangle):
 
     @source.setter
     def source(self,value):
+        from .app import GameApp
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
         self._source = value
         if self._defined:
@@ -103,7 +102,7 @@ class GSprite(GRectangle):
         self.source  = keywords['source'] if 'source' in keywords else None
         self._setFormat(keywords['format'] if 'format' in keywords else (1,1))
         self._frame  = 0
-        self._images = [None]*self.count
+        self._images = None
         self._bounds = None
         self._texture = None
         GRectangle.__init__(self,**keywords)
@@ -126,24 +125,17 @@ class GSprite(GRectangle):
         """
         Resets the drawing cache.
         """
+        from kivy.graphics import Rectangle, Color, Line, PopMatrix
+        from .app import GameApp
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
         
-        texture = GameApp.load_texture(self.source)
-        if texture:
-            width  = texture.width/self._format[1]
-            height = texture.height/self._format[0]
-            
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += width
-        else:
+        self._images = GameApp.load_frames(self.source,self._format)
+        GameApp.pin_texture(self,self.source)
+        if self._images is None:
             print('Failed to load',repr(self.source))
+            self._images = (None,)*self.count
         
         self._texture = self._images[self._frame]
         self._bounds = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
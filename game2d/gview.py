@@ -319,6 +319,12 @@ class GView(FloatLayout):
     :class:`GObject` instances to the :meth:`draw` method.  You must do this every
     animation frame, as the game is constantly clearing the window.
 
+    The view also supports a retained mode.  Shapes attached with the method ``attach``
+    in :class:`GObject` stay on screen between frames until they are detached, and
+    clearing the window does not remove them.  The cost of a frame then depends on what
+    changed, not on the number of shapes on screen.  Retained shapes are drawn below the
+    shapes drawn in immediate mode.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
@@ -337,6 +343,9 @@ class GView(FloatLayout):
         """
         FloatLayout.__init__(self)
         self._frame = InstructionGroup()
+        self._retained = InstructionGroup()
+        self._layers = {}
+        self._attached = {}
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
         self._reset()
@@ -363,11 +372,46 @@ class GView(FloatLayout):
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  It does
+        not remove attached commands.
         """
         self._frame.clear()
         self._contents.clear()
 
+    def attach(self,cmd,layer=0):
+        """
+        Attaches the given Kivy graphics command to this view in retained mode.
+
+        You should never call this method, since you do not understand raw Kivy graphics
+        commands.  Instead, you should use the `attach` method in :class:`GObject`.
+
+        :param cmd: the command to attach
+        :type cmd:  A Kivy graphics command
+
+        :param layer: the layer to draw the command in
+        :type layer:  ``int``
+        """
+        if cmd in self._attached:
+            return
+        if not layer in self._layers:
+            self._add_layer(layer)
+        self._layers[layer].add(cmd)
+        self._attached[cmd] = layer
+
+    def detach(self,cmd):
+        """
+        Detaches the given Kivy graphics command from this view.
+
+        You should never call this method, since you do not understand raw Kivy graphics
+        commands.  Instead, you should use the `detach` method in :class:`GObject`.
+
+        :param cmd: the command to detach
+        :type cmd:  A Kivy graphics command
+        """
+        layer = self._attached.pop(cmd,None)
+        if not layer is None:
+            self._layers[layer].remove(cmd)
+
     # HIDDEN METHODS
     def _reset(self,obj=None,value=None):
         """
@@ -378,4 +422,17 @@ class GView(FloatLayout):
         self.canvas.add(Rectangle(pos=self.pos,size=self.size))
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
+        self.canvas.add(self._retained)
         self.canvas.add(self._frame)
+
+    def _add_layer(self,layer):
+        """
+        Adds an empty layer for attached commands, keeping the layers in order
+
+        :param layer: the layer to add
+        :type layer:  ``int``
+        """
+        self._layers[layer] = InstructionGroup()
+        self._retained.clear()
+        for key in sorted(self._layers):
+            self._retained.add(self._layers[key])
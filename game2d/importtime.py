@@ -0,0 +1,87 @@
+"""
+Import time measurement for 2D game support.
+
+Kivy is slow to import, so the modules of this package only import it when a drawable
+(or the application) is actually created.  This module checks that this stays true.
+It imports each given module in a fresh Python interpreter, and reports how long the
+import took and whether it loaded Kivy.  Run it from the folder of the game, as in::
+
+    python -m game2d.importtime simulation models game2d.collision
+
+With no module names, it measures the package ``game2d`` and each of its modules that
+do not need Kivy.
+"""
+import json
+import subprocess
+import sys
+
+# The modules measured by default
+DEFAULT_MODULES = ('game2d', 'game2d.collision', 'game2d.mixer', 'game2d.gobject',
+                   'game2d.grectangle', 'game2d.gsprite', 'game2d.gbatch', 'game2d.sound')
+
+# The code run in the fresh interpreter to import a module
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import %s
+elapsed = time.perf_counter()-start
+print(json.dumps({'seconds': elapsed, 'kivy': 'kivy' in sys.modules,
+                  'introcs': 'introcs' in sys.modules}))
+"""
+
+
+def measure(module,repeat=3):
+    """
+    Returns: The time to import ``module`` in a fresh interpreter, and what it loaded
+
+    The import is repeated ``repeat`` times, each in a new interpreter, and the fastest
+    time is kept (the others are slowed down by the operating system, not the import).
+
+    :param module: The name of the module to import
+    :type module:  ``str``
+
+    :param repeat: The number of times to import the module
+    :type repeat:  ``int`` > 0
+
+    :return: The seconds taken, and whether Kivy and introcs were loaded
+    :rtype:  ``dict`` with keys 'seconds', 'kivy' and 'introcs'
+    """
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable,'-c',_PROBE % module],
+                                capture_output=True,text=True)
+        if output.returncode != 0:
+            lines = output.stderr.strip().splitlines()
+            raise ImportError('Cannot import %s: %s' % (module,lines[-1] if lines else '?'))
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def main(modules):
+    """
+    Measures and prints the import time of each module.
+
+    :param modules: The names of the modules to measure
+    :type modules:  ``list`` of ``str``
+
+    :return: The exit status (1 if a module could not be imported)
+    :rtype:  ``int``
+    """
+    status = 0
+    for module in modules:
+        try:
+            result = measure(module)
+        except ImportError as e:
+            print('%-20s %s' % (module,e))
+            status = 1
+            continue
+        loaded = [name for name in ('kivy','introcs') if result[name]]
+        print('%-20s %8.1f ms   %s' % (module,result['seconds']*1000,
+                                        'loads '+' and '.join(loaded) if loaded else ''))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:] or list(DEFAULT_MODULES)))
@@ -0,0 +1,602 @@
+"""
+An in-process audio mixer for 2D game support.
+
+Every :class:`Sound` normally plays through the Kivy audio backend, where each voice is
+a separate backend stream.  This module is an alternative.  Each WAV file is decoded
+once into a NumPy array of samples, and the voices that are playing are added together
+into a single output buffer every time the output asks for more audio.  Each voice has
+its own gain, and the number of voices that can play at once is fixed.
+
+The mixed audio goes to a sink.  A :class:`DeviceSink` sends it to the sound card (it
+needs the optional ``sounddevice`` package).  A :class:`NullSink` throws it away, so
+that the mixer can run (and its cost can be measured) without an audio device.
+
+Nothing in this module depends on Kivy.  The WAV files are read with ``struct`` rather
+than the standard ``wave`` module, as a game may well have a module of its own with
+that name.
+"""
+import os
+import struct
+import threading
+import time
+import numpy as np
+
+
+def decode_wav(path,rate=None):
+    """
+    Returns: The samples in the given WAV file, as floats in -1..1
+
+    The file must hold integer PCM samples (8, 16, 24 or 32 bit) or 32 bit float
+    samples.  If ``rate`` is given and differs from the rate of the file, the samples
+    are resampled (by linear interpolation) to that rate.
+
+    :param path: The path to the WAV file
+    :type path:  ``str``
+
+    :param rate: The sample rate to convert to (None to keep the rate of the file)
+    :type rate:  ``int`` > 0 or None
+
+    :return: The sample rate and the samples, one row per frame and one column per channel
+    :rtype:  ``tuple`` of ``int`` and ``numpy.ndarray`` of ``float32``
+    """
+    with open(path,'rb') as file:
+        data = file.read()
+    if data[0:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise IOError('%s is not a WAV file' % repr(path))
+    fmt = None
+    samples = None
+    pos = 12
+    while pos+8 <= len(data):
+        chunk, size = struct.unpack('<4sI',data[pos:pos+8])
+        body = data[pos+8:pos+8+size]
+        if chunk == b'fmt ':
+            fmt = body
+        elif chunk == b'data':
+            samples = body
+        pos += 8+size+(size & 1)
+    if fmt is None or samples is None:
+        raise IOError('%s is missing its format or data' % repr(path))
+    tag, channels, filerate, _, align, bits = struct.unpack('<HHIIHH',fmt[:16])
+    if tag == 0xFFFE and len(fmt) >= 26:
+        # An extensible format keeps the real format tag at the start of its subformat
+        tag = struct.unpack('<H',fmt[24:26])[0]
+    frames = len(samples)//align
+    samples = samples[:frames*align]
+    if tag == 3 and bits == 32:
+        pcm = np.frombuffer(samples,dtype='<f4').astype(np.float32)
+    elif tag == 1 and bits == 8:
+        pcm = (np.frombuffer(samples,dtype=np.uint8).astype(np.float32)-128)/128
+    elif tag == 1 and bits == 16:
+        pcm = np.frombuffer(samples,dtype='<i2').astype(np.float32)/32768
+    elif tag == 1 and bits == 24:
+        raw = np.frombuffer(samples,dtype=np.uint8).reshape(-1,3).astype(np.int32)
+        ints = raw[:,0] | (raw[:,1] << 8) | (raw[:,2] << 16)
+        ints = np.where(ints >= 1 << 23,ints-(1 << 24),ints)
+        pcm = ints.astype(np.float32)/(1 << 23)
+    elif tag == 1 and bits == 32:
+        pcm = np.frombuffer(samples,dtype='<i4').astype(np.float32)/(1 << 31)
+    else:
+        raise IOError('%s has an unsupported sample format' % repr(path))
+    pcm = pcm.reshape(-1,channels)
+    if rate and rate != filerate and len(pcm) > 1:
+        count = int(round(len(pcm)*rate/filerate))
+        times = np.arange(count)*(filerate/rate)
+        source = np.arange(len(pcm))
+        pcm = np.stack([np.interp(times,source,pcm[:,c]) for c in range(channels)],
+                       axis=1).astype(np.float32)
+        filerate = rate
+    return filerate, pcm
+
+
+# #mark -
+class Mixer(object):
+    """
+    A class that mixes decoded sounds into a single output buffer.
+
+    A sound is played with :meth:`play`, which returns a handle for the new voice.  The
+    handle can be used to change the gain of the voice, to stop it, or to check whether
+    it is still playing.  At most ``voices`` voices play at once; playing another sound
+    when every voice is busy stops the voice that started the longest time ago.
+
+    The output (a sink) calls :meth:`mix` every time it needs another block of audio.
+    This may happen on an audio thread, so every method of the mixer is thread-safe.
+
+    Each sound file is decoded the first time it is played (or when it is given to
+    :meth:`load`) and kept, converted to the rate and channels of the mixer, for as
+    long as the mixer exists.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def rate(self):
+        """
+        The sample rate of the output, in frames per second.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` > 0.
+        """
+        return self._rate
+
+    @property
+    def channels(self):
+        """
+        The number of channels of the output.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` > 0.
+        """
+        return self._channels
+
+    @property
+    def voices(self):
+        """
+        The number of voices that can play at once.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` > 0.
+        """
+        return self._voices
+
+    @property
+    def active(self):
+        """
+        The number of voices playing right now.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` in 0..voices.
+        """
+        return len(self._playing)
+
+    # MUTABLE PROPERTIES
+    @property
+    def gain(self):
+        """
+        The gain applied to the mixed output.
+
+        1 means full volume, 0 means mute.  The default value is 1.
+
+        **Invariant**: Must be a ``float`` in the range 0..1.
+        """
+        return self._gain
+
+    @gain.setter
+    def gain(self,value):
+        assert type(value) in [int,float] and value >= 0 and value <= 1, \
+            'value %s is not a valid gain' % repr(value)
+        self._gain = value
+
+
+    # BUILT-IN METHODS
+    def __init__(self,folder='.',rate=44100,channels=2,voices=32):
+        """
+        Creates a new mixer with no sound playing.
+
+        :param folder: The folder the sound files are in
+        :type folder:  ``str``
+
+        :param rate: The sample rate of the output, in frames per second
+        :type rate:  ``int`` > 0
+
+        :param channels: The number of channels of the output
+        :type channels:  ``int`` > 0
+
+        :param voices: The number of voices that can play at once
+        :type voices:  ``int`` > 0
+        """
+        assert type(rate) == int and rate > 0, '%s is not a valid rate' % repr(rate)
+        assert type(channels) == int and channels > 0, '%s is not a valid channel count' % repr(channels)
+        assert type(voices) == int and voices > 0, '%s is not a valid voice count' % repr(voices)
+        self._folder = folder
+        self._rate = rate
+        self._channels = channels
+        self._voices = voices
+        self._gain = 1
+        self._clips = {}
+        self._playing = {}
+        self._handle = 0
+        self._lock = threading.Lock()
+        self._sink = None
+
+
+    # PUBLIC METHODS
+    def load(self,source):
+        """
+        Decodes a sound file, unless it is already decoded.
+
+        :param source: The name of a sound file in the folder of this mixer
+        :type source:  ``str``
+
+        :return: The decoded samples
+        :rtype:  ``numpy.ndarray`` of ``float32`` with shape (frames, channels)
+        """
+        clip = self._clips.get(source)
+        if clip is None:
+            _, clip = decode_wav(os.path.join(self._folder,source),self._rate)
+            if clip.shape[1] != self._channels:
+                # Mix down to mono, then copy to every output channel
+                clip = np.repeat(clip.mean(axis=1,keepdims=True),self._channels,axis=1)
+            clip = np.ascontiguousarray(clip,dtype=np.float32)
+            self._clips[source] = clip
+        return clip
+
+    def open(self,source):
+        """
+        Returns: A new voice of the given sound, to use in place of a Kivy sound
+
+        The result has the same interface as a Kivy sound (``play``, ``stop``,
+        ``state``, ``volume`` and ``loop``), so a :class:`Sound` can play through the
+        mixer without knowing it.
+
+        :param source: The name of a sound file in the folder of this mixer
+        :type source:  ``str``
+
+        :rtype:  :class:`MixerSound`
+        """
+        self.load(source)
+        return MixerSound(self,source)
+
+    def play(self,source,gain=1,loop=False):
+        """
+        Starts a voice playing the given sound.
+
+        :param source: The name of a sound file in the folder of this mixer
+        :type source:  ``str``
+
+        :param gain: The gain of the new voice
+        :type gain:  ``int`` or ``float`` in 0..1
+
+        :param loop: Whether the voice should loop until it is stopped
+        :type loop:  ``bool``
+
+        :return: The handle of the new voice
+        :rtype:  ``int``
+        """
+        clip = self.load(source)
+        with self._lock:
+            if len(self._playing) >= self._voices:
+                # Handles only increase, so the smallest is the oldest voice
+                del self._playing[min(self._playing)]
+            self._handle += 1
+            self._playing[self._handle] = [clip,0,float(gain),bool(loop)]
+            return self._handle
+
+    def stop(self,handle=None):
+        """
+        Stops a voice, or every voice.
+
+        Stopping a voice that has already finished does nothing.
+
+        :param handle: The handle of the voice (None to stop every voice)
+        :type handle:  ``int`` or None
+        """
+        with self._lock:
+            if handle is None:
+                self._playing.clear()
+            else:
+                self._playing.pop(handle,None)
+
+    def is_playing(self,handle):
+        """
+        :param handle: The handle of a voice
+        :type handle:  ``int``
+
+        :return: True if the voice is still playing; False otherwise
+        :rtype:  ``bool``
+        """
+        return handle in self._playing
+
+    def set_gain(self,handle,gain):
+        """
+        Changes the gain of a voice that is playing.
+
+        Changing the gain of a voice that has already finished does nothing.
+
+        :param handle: The handle of the voice
+        :type handle:  ``int``
+
+        :param gain: The new gain of the voice
+        :type gain:  ``int`` or ``float`` in 0..1
+        """
+        with self._lock:
+            voice = self._playing.get(handle)
+            if voice:
+                voice[2] = float(gain)
+
+    def mix(self,frames,out=None):
+        """
+        Mixes the next block of audio.
+
+        Each voice playing adds its next ``frames`` frames (scaled by its gain) to the
+        block.  Voices that reach their end stop, unless they loop.  The result is
+        scaled by the gain of the mixer and clipped to -1..1.
+
+        :param frames: The number of frames in the block
+        :type frames:  ``int`` >= 0
+
+        :param out: An array to mix into, instead of a new one
+        :type out:  ``numpy.ndarray`` of ``float32`` with shape (frames, channels), or None
+
+        :return: The mixed block
+        :rtype:  ``numpy.ndarray`` of ``float32`` with shape (frames, channels)
+        """
+        if out is None:
+            out = np.zeros((frames,self._channels),dtype=np.float32)
+        else:
+            out.fill(0)
+        with self._lock:
+            done = []
+            for handle, voice in self._playing.items():
+                clip, pos, gain, loop = voice
+                filled = 0
+                while filled < frames:
+                    count = min(frames-filled,len(clip)-pos)
+                    if count > 0:
+                        out[filled:filled+count] += gain*clip[pos:pos+count]
+                        filled += count
+                        pos += count
+                    if pos >= len(clip):
+                        if not loop or len(clip) == 0:
+                            break
+                        pos = 0
+                voice[1] = pos
+                if pos >= len(clip) and not loop:
+                    done.append(handle)
+            for handle in done:
+                del self._playing[handle]
+        if self._gain != 1:
+            out *= self._gain
+        np.clip(out,-1,1,out=out)
+        return out
+
+    def start(self,sink):
+        """
+        Starts sending the mixed audio to the given sink.
+
+        Any sink the mixer was already using is stopped first.
+
+        :param sink: The output for the mixed audio
+        :type sink:  :class:`NullSink` or :class:`DeviceSink`
+        """
+        self.close()
+        self._sink = sink
+        sink.start(self)
+
+    def close(self):
+        """
+        Stops the sink (if any) and every voice.
+
+        The decoded sounds are kept, so the mixer can be started again.
+        """
+        if not self._sink is None:
+            self._sink.stop()
+            self._sink = None
+        self.stop()
+
+
+# #mark -
+class MixerSound(object):
+    """
+    A class representing one voice of a sound, played through a :class:`Mixer`.
+
+    This class has the same interface as a Kivy sound, so that a :class:`Sound` can use
+    it as one of its voices.  Each call to :meth:`play` starts a new voice on the mixer,
+    stopping the previous one if it is still playing.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def volume(self):
+        """
+        The gain of this sound.
+
+        **Invariant**: Must be a ``float`` in the range 0..1.
+        """
+        return self._volume
+
+    @volume.setter
+    def volume(self,value):
+        self._volume = value
+        if not self._handle is None:
+            self._mixer.set_gain(self._handle,value)
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def state(self):
+        """
+        The state of this sound, as in Kivy.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be one of 'play' or 'stop'.
+        """
+        if not self._handle is None and self._mixer.is_playing(self._handle):
+            return 'play'
+        return 'stop'
+
+    # BUILT-IN METHODS
+    def __init__(self,mixer,source):
+        """
+        Creates a new sound that plays through the given mixer.
+
+        :param mixer: The mixer to play through
+        :type mixer:  :class:`Mixer`
+
+        :param source: The name of a sound file in the folder of the mixer
+        :type source:  ``str``
+        """
+        self._mixer = mixer
+        self._source = source
+        self._handle = None
+        self._volume = 1
+        self.loop = False
+
+    # PUBLIC METHODS
+    def play(self):
+        """
+        Plays this sound from the start.
+        """
+        self.stop()
+        self._handle = self._mixer.play(self._source,self._volume,self.loop)
+
+    def stop(self):
+        """
+        Stops this sound.
+        """
+        if not self._handle is None:
+            self._mixer.stop(self._handle)
+            self._handle = None
+
+
+# #mark -
+class NullSink(object):
+    """
+    A class representing an output that throws the mixed audio away.
+
+    A null sink has no audio device, so nothing asks it for audio.  Instead, call
+    :meth:`pull` to mix blocks of audio, for example once per animation frame.  The sink
+    records how much audio it mixed and how long the mixing took, which makes it a way
+    to measure the cost of the mixer in a headless run.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def frames(self):
+        """
+        The number of frames mixed so far.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._frames
+
+    @property
+    def elapsed(self):
+        """
+        The time spent mixing so far, in seconds.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a ``float`` >= 0.
+        """
+        return self._elapsed
+
+    @property
+    def load(self):
+        """
+        The time spent mixing, as a fraction of the length of the audio mixed.
+
+        A value of 0.01 means that mixing takes 1% of the time the audio lasts.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a ``float`` >= 0.
+        """
+        if self._mixer is None or self._frames == 0:
+            return 0.0
+        return self._elapsed/(self._frames/self._mixer.rate)
+
+    # BUILT-IN METHODS
+    def __init__(self,blocksize=512):
+        """
+        Creates a new null sink.
+
+        :param blocksize: The number of frames in each block
+        :type blocksize:  ``int`` > 0
+        """
+        self._blocksize = blocksize
+        self._mixer = None
+        self._buffer = None
+        self._frames = 0
+        self._elapsed = 0.0
+
+    # PUBLIC METHODS
+    def start(self,mixer):
+        """
+        Starts taking audio from the given mixer.
+
+        :param mixer: The mixer to take audio from
+        :type mixer:  :class:`Mixer`
+        """
+        self._mixer = mixer
+        self._buffer = np.zeros((self._blocksize,mixer.channels),dtype=np.float32)
+
+    def stop(self):
+        """
+        Stops taking audio from the mixer.
+        """
+        self._mixer = None
+
+    def pull(self,blocks=1):
+        """
+        Mixes (and throws away) the given number of blocks.
+
+        :param blocks: The number of blocks to mix
+        :type blocks:  ``int`` >= 0
+        """
+        if self._mixer is None:
+            return
+        start = time.perf_counter()
+        for _ in range(blocks):
+            self._mixer.mix(self._blocksize,self._buffer)
+        self._elapsed += time.perf_counter()-start
+        self._frames += blocks*self._blocksize
+
+
+# #mark -
+class DeviceSink(object):
+    """
+    A class representing the sound card as an output.
+
+    The sound card asks the mixer for a block of audio every time it needs one, on its
+    own audio thread.  This class needs the optional ``sounddevice`` package; creating
+    one without that package raises an ``ImportError``.
+    """
+
+    # BUILT-IN METHODS
+    def __init__(self,blocksize=512,device=None):
+        """
+        Creates a new sink for the sound card.
+
+        :param blocksize: The number of frames in each block
+        :type blocksize:  ``int`` > 0
+
+        :param device: The sound card to use (None for the default one)
+        :type device:  ``int``, ``str`` or None
+        """
+        try:
+            import sounddevice
+        except ImportError:
+            raise ImportError('The mixer needs the package sounddevice to play audio')
+        self._sounddevice = sounddevice
+        self._blocksize = blocksize
+        self._device = device
+        self._stream = None
+
+    # PUBLIC METHODS
+    def start(self,mixer):
+        """
+        Starts playing audio from the given mixer.
+
+        :param mixer: The mixer to take audio from
+        :type mixer:  :class:`Mixer`
+        """
+        def callback(outdata, frames, time, status):
+            mixer.mix(frames,outdata)
+        self._stream = self._sounddevice.OutputStream(samplerate=mixer.rate,
+            channels=mixer.channels,dtype='float32',blocksize=self._blocksize,
+            device=self._device,callback=callback)
+        self._stream.start()
+
+    def stop(self):
+        """
+        Stops playing audio.
+        """
+        if not self._stream is None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
@@ -0,0 +1,239 @@
+"""
+Background asset loading for 2D game support.
+
+Loading an image, sound or font the first time it is used stalls the animation frame
+that uses it.  This module loads them ahead of time instead.  Images are read and
+decoded on a worker thread, and so are sounds if the game plays them through a mixer.
+The parts that must happen on the main thread (uploading textures to the graphics card)
+are done a little at a time, in small slices at the start of each animation frame.
+
+Kivy can only open sounds and fonts on the main thread, so without a mixer they get no
+help from the worker.  They are opened whole, one per slice, which only moves that
+work from the first frame that uses them to the loading screen.
+
+You should never use this module directly.  Use the method ``preload`` in
+:class:`GameApp` instead.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+
+class Preloader(object):
+    """
+    A class that loads the files in the Images, Sounds and Fonts folders in the background.
+
+    Each asset goes through a worker thread, which decodes the images (and the sounds,
+    if there is a mixer), and is then put in a queue.  The main thread calls :meth:`step`
+    once per animation frame, which finishes assets from the queue until it runs out of
+    time for that frame.  A finished image is in the texture cache of :class:`GameApp`,
+    a finished sound is in its sound cache, and a finished font has been opened once so
+    that the first label using it is fast.
+
+    Without a mixer, each voice of a :class:`Sound` is a Kivy sound of its own.  So each
+    sound is opened ``voices`` times, to be used by a :class:`Sound` with that many
+    voices.  A mixer shares the decoded sound between its voices, so then each sound
+    is only decoded once.
+
+    Assets that fail to load are skipped (they will fail again, with an error, when the
+    game uses them).  They still count towards the progress, so that the progress always
+    reaches 1.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def total(self):
+        """
+        The number of assets to load.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return len(self._assets)
+
+    @property
+    def loaded(self):
+        """
+        The number of assets finished (or skipped) so far.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` in 0..total.
+        """
+        return self._loaded
+
+    @property
+    def progress(self):
+        """
+        The fraction of the assets finished so far.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a ``float`` in 0..1.
+        """
+        return 1.0 if not self._assets else self._loaded/len(self._assets)
+
+    @property
+    def done(self):
+        """
+        Whether every asset has been finished.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a ``bool``.
+        """
+        return self._loaded == len(self._assets)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,images,sounds,fonts,voices=1):
+        """
+        Creates a new preloader.  It does not start loading until :meth:`start`.
+
+        :param images: The file names of the images in the **Images** folder to load
+        :type images:  ``list`` of ``str``
+
+        :param sounds: The file names of the sounds in the **Sounds** folder to load
+        :type sounds:  ``list`` of ``str``
+
+        :param fonts: The file names of the fonts in the **Fonts** folder to load
+        :type fonts:  ``list`` of ``str``
+
+        :param voices: The number of copies of each sound to open
+        :type voices:  ``int`` > 0
+        """
+        from .app import GameApp
+        assert type(voices) == int and voices > 0, '%s is not a valid voice count' % repr(voices)
+        if not GameApp.MIXER is None:
+            voices = 1
+        self._assets = ([('image',name) for name in images] +
+                        [('sound',name) for name in sounds for _ in range(voices)] +
+                        [('font',name) for name in fonts])
+        self._loaded = 0
+        self._queue  = queue.Queue()
+        self._thread = None
+
+
+    # PUBLIC METHODS
+    def start(self):
+        """
+        Starts the worker thread.
+
+        Starting a preloader that has already started does nothing.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work,daemon=True)
+            self._thread.start()
+
+    def step(self,budget):
+        """
+        Finishes loaded assets on the main thread for up to ``budget`` seconds.
+
+        At least one asset is finished (if one is ready), so loading always makes
+        progress no matter how small the budget is.
+
+        :param budget: The time to spend in this call, in seconds
+        :type budget:  ``int`` or ``float`` >= 0
+
+        :return: True if every asset has been finished; False otherwise
+        :rtype:  ``bool``
+        """
+        deadline = time.perf_counter()+budget
+        while not self.done:
+            try:
+                kind, name, data = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if not data is None:
+                try:
+                    self._finish(kind,name,data)
+                except:
+                    pass
+            self._loaded += 1
+            if time.perf_counter() >= deadline:
+                break
+        return self.done
+
+
+    # HIDDEN METHODS
+    def _work(self):
+        """
+        Decodes every asset that can be decoded here, putting the results in the queue.
+
+        This method runs on the worker thread.  It must not touch the graphics card.
+        Kivy sounds and fonts can only be opened on the main thread, so they are passed
+        on as they are (with their file name as their data).
+        """
+        from .app import GameApp
+        for kind, name in self._assets:
+            data = name
+            try:
+                if kind == 'image':
+                    from kivy.core.image import ImageLoader
+                    data = ImageLoader.load(os.path.join(GameApp.images,name))
+                elif kind == 'sound' and not GameApp.MIXER is None:
+                    # The mixer decodes off the main thread, so there is nothing left
+                    GameApp.MIXER.load(name)
+                    data = None
+            except:
+                data = None
+            self._queue.put((kind,name,data))
+
+    def _finish(self,kind,name,data):
+        """
+        Finishes a single asset on the main thread.
+
+        :param kind: The type of asset
+        :type kind:  one of 'image', 'sound' or 'font'
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param data: The decoded image, or the file name of a sound or font
+        :type data:  ``ImageLoaderBase`` or ``str``
+        """
+        from .app import GameApp
+        if kind == 'image':
+            if not name in GameApp.TEXTURE_CACHE:
+                from kivy.core.image import Image
+                GameApp._cache_texture(name,Image(data).texture)
+        elif kind == 'sound':
+            from kivy.core.audio import SoundLoader
+            sound = SoundLoader.load(name)
+            if not sound is None:
+                GameApp.SOUND_CACHE.setdefault(name,[]).append(sound)
+        else:
+            from kivy.core.text import Label as CoreLabel
+            CoreLabel(text='0',font_name=name).refresh()
+
+
+def asset_files(folder,extensions):
+    """
+    Returns: The files in ``folder`` with one of the given extensions, sorted by name
+
+    Images that are pages of a texture atlas (listed in a .atlas file in the folder)
+    are left out, since they are loaded with the atlas.
+
+    :param folder: The folder to search
+    :type folder:  ``str``
+
+    :param extensions: The file extensions to look for (in lower case, with the dot)
+    :type extensions:  ``tuple`` of ``str``
+    """
+    try:
+        names = sorted(os.listdir(folder))
+    except OSError:
+        return []
+    pages = set()
+    for name in names:
+        if name.lower().endswith('.atlas'):
+            try:
+                with open(os.path.join(folder,name)) as file:
+                    pages.update(json.load(file).keys())
+            except (OSError,ValueError):
+                pass
+    return [name for name in names
+            if os.path.splitext(name)[1].lower() in extensions and not name in pages]
@@ -6,8 +6,8 @@ This classes wrap the Kivy audio interface, making it simpler for students to us
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
-from .app import GameApp
+# Kivy is imported where it is used, so that importing this module does not load it
+import time
 
 
 class Sound(object):
@@ -19,13 +19,25 @@ class Sound(object):
     platforms. In order for Kivy to find a WAV or MP3 file, you should put it in the
     **Sounds** directory.  Sounds in that folder can be referenced directly by name.
     
-    When a sound is played, it cannot be played again until it finishes, or is stopped.  
-    This means that if you want multiple, simultaneous sound effects from the same WAV 
-    file.you will need to create multiple Sound objects.
+    A sound has one or more voices, each of which is a separate copy of the sound loaded
+    when the sound is created.  A voice that is playing cannot be played again until it
+    finishes, or is stopped.  So a sound with one voice (the default) plays at most one
+    copy at a time.  A sound with several voices can play that many copies at once,
+    which is what you want for a sound effect that may be played in quick succession.
+    
+    When every voice is busy, :meth:`play` steals one of them, restarting it.  The
+    attribute ``steal`` decides which voice: 'oldest' steals the voice that started
+    playing the longest time ago, while 'round-robin' steals the voices in turn.
+    
+    Sounds normally play through Kivy audio.  If the game has called the method
+    ``use_mixer`` of :class:`GameApp`, new sounds play through its mixer instead.
     """
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
     
+    # The policies for choosing a voice to restart
+    STEAL_POLICIES = ('oldest','round-robin')
+    
     # MUTABLE PROPERTIES
     @property
     def volume(self):
@@ -36,13 +48,32 @@ class Sound(object):
         
         **Invariant**: Must float in the range 0..1.
         """
-        return self._sound.volume
+        return self._volume
     
     @volume.setter
     def volume(self,value):
         assert type(value) in [int, float] and value >= 0 and value <= 1, \
             'value %s is not a valid volume' % repr(value)
-        self._sound.volume = value
+        self._volume = value
+        for voice in self._voices:
+            voice.volume = value
+    
+    @property
+    def steal(self):
+        """
+        The policy for choosing a voice to restart when every voice is busy.
+        
+        'oldest' restarts the voice that started playing the longest time ago.
+        'round-robin' restarts the voices in turn.  The default value is 'oldest'.
+        
+        **Invariant**: Must be one of 'oldest' or 'round-robin'.
+        """
+        return self._steal
+    
+    @steal.setter
+    def steal(self,value):
+        assert value in self.STEAL_POLICIES, 'value %s is not a valid policy' % repr(value)
+        self._steal = value
     
     # IMMUTABLE PROPERTIES
     @property
@@ -56,6 +87,17 @@ class Sound(object):
         """ 
         return self._source
     
+    @property
+    def voices(self):
+        """
+        The number of copies of this sound that can play at once.
+        
+        **Immutable**: This value cannot be changed after the sound is loaded.
+        
+        **Invariant**: Must be an int > 0.
+        """ 
+        return len(self._voices)
+    
     @property
     def playing(self):
         """
@@ -64,43 +106,91 @@ class Sound(object):
         **Immutable**: This value cannot be changed.  You should use the :meth:`play` 
         and :meth:`stop` methods to alter its value.
         
+        This is True if any voice of the sound is playing.
+        
         **Invariant**: Must be a boolean.
         """ 
-        return self._sound.state == 'play'
+        return any(voice.state == 'play' for voice in self._voices)
     
-    def __init__(self,source):
+    def __init__(self,source,voices=1,steal='oldest'):
         """
         Creates a new sound from a file.
         
+        Every voice is loaded now, so that playing the sound never has to load it.
+        
         :param source: The string providing the name of a sound file
         :type source:  ``str``
+        
+        :param voices: The number of copies of the sound that can play at once
+        :type voices:  ``int`` > 0
+        
+        :param steal: The policy for choosing a voice when every voice is busy
+        :type steal:  one of 'oldest' or 'round-robin'
         """
+        from kivy.core.audio import SoundLoader
         from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
+        assert type(voices) == int and voices > 0, '%s is not a valid voice count' % repr(voices)
         self._source = source
-        self._sound  = SoundLoader.load(source)
-        if self._sound is None:
-            raise IOError('Module game2d cannot read the file %s' % repr(source))
+        self._voices = []
+        preloaded = GameApp.SOUND_CACHE.get(source)
+        for pos in range(voices):
+            if not GameApp.MIXER is None:
+                sound = GameApp.MIXER.open(source)
+            elif preloaded:
+                sound = preloaded.pop()
+            else:
+                sound = SoundLoader.load(source)
+            if sound is None:
+                raise IOError('Module game2d cannot read the file %s' % repr(source))
+            self._voices.append(sound)
+        self._started = [0.0]*voices
+        self._next = 0
+        self._volume = 1
+        self.steal = steal
     
     def play(self,loop=False):
         """
         Plays this sound.
         
-        The sound will play until completion, or interrupted by the user.
+        The sound will play until completion, or interrupted by the user.  It plays on
+        a voice that is not busy if there is one.  Otherwise it restarts the voice
+        chosen by the attribute ``steal``.
         
         :param loop: Whether or not to loop the sound
         :type loop:  ``bool``
         """
-        self._sound.loop = loop
-        self._sound.play()
+        pos = self._choose()
+        voice = self._voices[pos]
+        if voice.state == 'play':
+            voice.stop()
+        voice.loop = loop
+        voice.play()
+        self._started[pos] = time.perf_counter()
+        self._next = (pos+1) % len(self._voices)
 
     def stop(self):
         """
         Stops this sound.
         
-        This will stop the sound immediately, even if it is looping.
+        This will stop every voice immediately, even if it is looping.
         """
-        self._sound.stop()
+        for voice in self._voices:
+            voice.stop()
+    
+    def _choose(self):
+        """
+        :return: The position of the voice to play next
+        :rtype:  ``int``
+        """
+        count = len(self._voices)
+        for step in range(count):
+            pos = (self._next+step) % count
+            if self._voices[pos].state != 'play':
+                return pos
+        if self._steal == 'oldest':
+            return min(range(count),key=self._started.__getitem__)
+        return self._next
 
 
 # #mark -
@@ -118,13 +208,57 @@ class SoundLibrary(object):
     To play the sound, we access it as follows::
         
         soundlib['soundname'].play()
+    
+    Every sound in the library is loaded with the same number of voices and the same
+    policy for stealing them (see :class:`Sound`).  Give a sound effect several voices
+    so that playing it again in quick succession does not cut off the last copy.
     """
     
-    def __init__(self):
+    @property
+    def voices(self):
+        """
+        The number of voices of each sound loaded into this library.
+        
+        Changing this value only affects the sounds loaded afterwards.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._voices
+    
+    @voices.setter
+    def voices(self,value):
+        assert type(value) == int and value > 0, '%s is not a valid voice count' % repr(value)
+        self._voices = value
+    
+    @property
+    def steal(self):
+        """
+        The policy for stealing voices of each sound loaded into this library.
+        
+        Changing this value only affects the sounds loaded afterwards.
+        
+        **Invariant**: Must be one of 'oldest' or 'round-robin'.
+        """
+        return self._steal
+    
+    @steal.setter
+    def steal(self,value):
+        assert value in Sound.STEAL_POLICIES, 'value %s is not a valid policy' % repr(value)
+        self._steal = value
+    
+    def __init__(self,voices=1,steal='oldest'):
         """
         Creates a new, empty sound library.
+        
+        :param voices: The number of voices of each sound
+        :type voices:  ``int`` > 0
+        
+        :param steal: The policy for choosing a voice when every voice is busy
+        :type steal:  one of 'oldest' or 'round-robin'
         """
         self._data = {}
+        self.voices = voices
+        self.steal = steal
     
     def __len__(self):
         """
@@ -155,7 +289,7 @@ class SoundLibrary(object):
         :param filename: The name of the file containing the sound source
         :type filename:  ``str``
         """
-        self._data[key] = Sound(filename)
+        self._data[key] = Sound(filename,self._voices,self._steal)
     
     def __delitem__(self, key):
         """
@@ -82,24 +82,6 @@ class Ship(GImage):
         # Call the GImage Initializer
         super().__init__(x=x, y=y, width=width, height=height, source=source)
 
-    # HELPER METHOD TO CHECK FOR COLLISIONS
-    def collides(self, bolt):
-        """
-        Returns: True if the bolt was fired by an alien and collides with the player
-
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
-        """
-        left_edge = bolt.x - (BOLT_WIDTH/2)
-        right_edge = bolt.x + (BOLT_WIDTH/2)
-        top_edge = bolt.y + (BOLT_HEIGHT/2)
-        bottom_edge = bolt.y - (BOLT_HEIGHT/2)
-        top_left = super().contains((left_edge, top_edge))
-        bot_left = super().contains((left_edge, bottom_edge))
-        top_right = super().contains((right_edge, top_edge))
-        bot_right = super().contains((right_edge, bottom_edge))
-        return top_left or bot_left or top_right or bot_right
-
 
 class Alien(GImage):
     """
@@ -149,24 +131,6 @@ class Alien(GImage):
         # Call GImage Intializer
         super().__init__(x=x, y=y, width=width, height=height, source=source)
 
-    # METHOD TO CHECK FOR COLLISION (IF DESIRED)
-    def collides(self, bolt):
-        """
-        Returns: True if the bolt was fired by the player and collides with this alien
-
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
-        """
-        left_edge = bolt.x - (BOLT_WIDTH/2)
-        right_edge = bolt.x + (BOLT_WIDTH/2)
-        top_edge = bolt.y + (BOLT_HEIGHT/2)
-        bottom_edge = bolt.y - (BOLT_HEIGHT/2)
-        top_left = super().contains((left_edge, top_edge))
-        bot_left = super().contains((left_edge, bottom_edge))
-        top_right = super().contains((right_edge, top_edge))
-        bot_right = super().contains((right_edge, bottom_edge))
-        return top_left or bot_left or top_right or bot_right
-
 
 class Bolt(GRectangle):
     """
@@ -230,3 +194,82 @@ class Bolt(GRectangle):
 
         # Set Velocity
         self._velocity = BOLT_VELOCITY
+
+    # METHOD TO REUSE A BOLT
+    def activate(self, x, y, velocity):
+        """
+        Moves this bolt to a new position and gives it a new velocity
+
+        This lets a bolt from a BoltPool be fired again without building a new
+        GRectangle (and its graphics instructions).
+
+        Parameter: x, x-coordinate of bolt center
+        Precondition: Must be a number, int or float
+
+        Parameter: y, y-coordinate of bolt center
+        Precondition: Must be a number, int or float
+
+        Parameter: velocity, how far the bolt moves each frame
+        Precondition: Must be a number, int or float
+        """
+        self.x = x
+        self.y = y
+        self._velocity = velocity
+
+
+class BoltPool(object):
+    """
+    A class representing a pool of reusable laser bolts.
+
+    Building a Bolt is expensive, because GRectangle parses its color and creates its
+    graphics instructions.  A pool builds its bolts ahead of time.  Wave acquires a bolt
+    when one is fired and releases it when it leaves the screen or hits something, so
+    steady-state play does not allocate any bolts.  If the pool runs out, it builds a
+    new bolt, which is kept once released.
+
+    INSTANCE ATTRIBUTES:
+        _free: the bolts that are not on screen [list of Bolt]
+    """
+
+    def __init__(self, size):
+        """
+        Creates a pool of bolts
+
+        Parameter: size, the number of bolts to build ahead of time
+        Precondition: Must be an int >= 0
+        """
+        self._free = [Bolt(0, 0, 0) for _ in range(size)]
+
+    def __len__(self):
+        """
+        Returns: The number of bolts in the pool that are not on screen
+        """
+        return len(self._free)
+
+    def acquire(self, x, y, velocity):
+        """
+        Returns: A bolt from the pool, moved to (x,y) with the given velocity
+
+        Parameter: x, x-coordinate of bolt center
+        Precondition: Must be a number, int or float
+
+        Parameter: y, y-coordinate of bolt center
+        Precondition: Must be a number, int or float
+
+        Parameter: velocity, how far the bolt moves each frame
+        Precondition: Must be a number, int or float
+        """
+        if self._free:
+            bolt = self._free.pop()
+            bolt.activate(x, y, velocity)
+            return bolt
+        return Bolt(x, y, velocity)
+
+    def release(self, bolt):
+        """
+        Returns a bolt to the pool so it can be fired again
+
+        Parameter: bolt, the bolt that is no longer on screen
+        Precondition: Must be a Bolt acquired from this pool
+        """
+        self._free.append(bolt)
@@ -0,0 +1,1034 @@
+"""
+Simulation module for Alien Invaders
+
+This module contains the headless simulation core for a single wave.  It keeps track
+of the positions, sizes, velocities and existence of the ship, the aliens and the laser
+bolts, and advances them one step at a time.
+
+Nothing in this module is drawn.  The classes here are plain Python objects, so a wave
+can be simulated without Kivy (for example, to balance the game or to evaluate a bot).
+The class Wave in wave.py drives this core and attaches the Kivy objects from models.py
+as an optional view layer.
+"""
+import random
+
+import numpy as np
+
+from consts import *
+from game2d.collision import aabb_hits
+
+# PRIMARY RULE: The simulation is not allowed to access anything in any module other
+# than consts.py and the parts of game2d without Kivy.  In particular, it must never
+# import Kivy, the game2d drawables or models.py.
+
+
+class Body(object):
+    """
+    A class representing a rectangular object in the simulation.
+
+    A body has the same geometry as a GObject: the attributes x and y refer to the
+    center of the rectangle.  However, it has no drawing state, so it can be created
+    and moved without Kivy.
+
+    INSTANCE ATTRIBUTES:
+        x:      the horizontal coordinate of the body center [int or float]
+        y:      the vertical coordinate of the body center [int or float]
+        width:  the horizontal width of the body [int or float > 0]
+        height: the vertical height of the body [int or float > 0]
+    """
+
+    # INITIALIZER TO CREATE A BODY
+    def __init__(self, x, y, width, height):
+        """
+        Creates a new rectangular body
+
+        Parameter: x, x-coordinate of the body center
+        Precondition: Must be a number, int or float
+
+        Parameter: y, y-coordinate of the body center
+        Precondition: Must be a number, int or float
+
+        Parameter: width, horizontal length of the body
+        Precondition: Must be a number, int or float > 0
+
+        Parameter: height, vertical length of the body
+        Precondition: Must be a number, int or float > 0
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    # METHOD TO CHECK FOR COLLISIONS
+    def bounds(self):
+        """
+        Returns: The bounding box (left, bottom, right, top) of this body
+        """
+        return (self.x-self.width/2.0, self.y-self.height/2.0,
+                self.x+self.width/2.0, self.y+self.height/2.0)
+
+    def contains(self, point):
+        """
+        Returns: True if this body contains the point; False otherwise
+
+        This is the same test as GObject.contains for an unrotated object.
+
+        Parameter point: the point to check
+        Precondition: point is a pair of numbers
+        """
+        return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
+
+
+class Formation(object):
+    """
+    A class representing the grid of aliens in the simulation.
+
+    The formation is stored as a structure of arrays.  There is a contiguous NumPy
+    array for the x-coordinates of the alien centers, one for the y-coordinates, an
+    alive mask, and the alien type (an index into ALIEN_IMAGES).  All of them have
+    shape (rows, cols), and row 0 is the bottom row.
+
+    Dead aliens keep their place in the arrays and simply stop being alive.  That way
+    every alien moves together, and a march step is a single vectorized add no matter
+    how many aliens there are.  It also means every alien in a column has the same
+    x-coordinate, and every alien in a row has the same y-coordinate.
+
+    The formation keeps the number of live aliens in each row and column, and the
+    leftmost, rightmost, lowest and highest rows and columns that still have a live
+    alien.  These only change when an alien is killed, so the edges of the formation
+    (and its bounding box) can be found without looking at every alien.
+
+    Because the aliens sit on a regular lattice that moves as a whole, the column a
+    bolt can hit is found with arithmetic: the lattice column nearest to the bolt.  This
+    requires BOLT_WIDTH <= ALIEN_H_SEP, so that a bolt can never reach past the gap
+    around its nearest column.  Bolts are tested along the whole path they swept in a
+    step, which may cross several rows, so they cannot tunnel through an alien however
+    far they move in one step.
+
+    For alien fire, the formation also keeps the lowest live alien in each column and
+    the list of columns with at least one live alien.  Picking a shooter is then a
+    single random choice from that list.
+
+    INSTANCE ATTRIBUTES:
+        _x:     the x-coordinates of the alien centers [float array of shape (rows, cols)]
+        _y:     the y-coordinates of the alien centers [float array of shape (rows, cols)]
+        _alive: whether each alien is alive [bool array of shape (rows, cols)]
+        _kind:  the alien type, used to pick its image [int array of shape (rows, cols),
+                values in 0..len(ALIEN_IMAGES)-1]
+        _count:  the number of live aliens [int >= 0]
+        _rowcount: the number of live aliens in each row [list of int >= 0]
+        _colcount: the number of live aliens in each column [list of int >= 0]
+        _left:   the leftmost column with a live alien [int >= 0]
+        _right:  the rightmost column with a live alien [int, _right < _left if empty]
+        _bottom: the lowest row with a live alien [int >= 0]
+        _top:    the highest row with a live alien [int, _top < _bottom if empty]
+        _lowest: the lowest row with a live alien in each column [list of int, -1 for
+                 an empty column]
+        _columns: the columns with at least one live alien, in no particular order
+                 [list of int, no duplicates]
+        _colslot: the position of each column in _columns [list of int, -1 for an
+                 empty column]
+    """
+
+    # GETTERS
+    def getRows(self):
+        """
+        Returns: The number of rows in the formation
+        """
+        return self._alive.shape[0]
+
+    def getCols(self):
+        """
+        Returns: The number of aliens in each row of the formation
+        """
+        return self._alive.shape[1]
+
+    def getX(self):
+        """
+        Returns: The array of alien x-coordinates (do not modify it)
+        """
+        return self._x
+
+    def getY(self):
+        """
+        Returns: The array of alien y-coordinates (do not modify it)
+        """
+        return self._y
+
+    def getAlive(self):
+        """
+        Returns: The alive mask of the aliens (do not modify it)
+        """
+        return self._alive
+
+    def getKind(self):
+        """
+        Returns: The array of alien types (do not modify it)
+        """
+        return self._kind
+
+    # INITIALIZER TO CREATE THE ALIENS
+    def __init__(self, rows, cols):
+        """
+        Creates a formation of live aliens.
+
+        The aliens are placed ALIEN_H_SEP from the left edge and so that the top row is
+        ALIEN_CEILING from the top of the window.  Each image in ALIEN_IMAGES is used
+        for two rows, starting from the bottom, and starting over once all of the
+        images have been used.
+
+        Parameter: rows, the number of rows of aliens
+        Precondition: Must be an int > 0
+
+        Parameter: cols, the number of aliens in each row
+        Precondition: Must be an int > 0
+        """
+        # Bolts are only tested against their nearest lattice column (see above)
+        assert BOLT_WIDTH <= ALIEN_H_SEP, 'BOLT_WIDTH %s is wider than ALIEN_H_SEP %s' % (
+            repr(BOLT_WIDTH), repr(ALIEN_H_SEP))
+        bottom = GAME_HEIGHT-ALIEN_CEILING - rows*(ALIEN_HEIGHT+ALIEN_V_SEP) + ALIEN_HEIGHT/2
+        xs = ALIEN_H_SEP + ALIEN_WIDTH/2 + np.arange(cols)*(ALIEN_WIDTH+ALIEN_H_SEP)
+        ys = bottom + np.arange(rows)*(ALIEN_HEIGHT+ALIEN_V_SEP)
+        kinds = (np.arange(rows) // 2) % len(ALIEN_IMAGES)
+        # Tile and repeat always copy, so the arrays are writable for any shape
+        self._x = np.tile(xs, (rows, 1)).astype(float)
+        self._y = np.repeat(ys[:, None], cols, axis=1).astype(float)
+        self._alive = np.ones((rows, cols), dtype=bool)
+        self._kind = np.repeat(kinds[:, None], cols, axis=1)
+        self._count = rows*cols
+        self._rowcount = [cols]*rows
+        self._colcount = [rows]*cols
+        self._left = 0
+        self._right = cols-1
+        self._bottom = 0
+        self._top = rows-1
+        self._lowest = [0]*cols
+        self._columns = list(range(cols))
+        self._colslot = list(range(cols))
+
+    # METHODS TO QUERY THE FORMATION
+    def count(self):
+        """
+        Returns: The number of live aliens in the formation
+        """
+        return self._count
+
+    def is_empty(self):
+        """
+        Returns: True if every alien in the formation is dead; False otherwise
+        """
+        return self._right < self._left
+
+    def extent(self):
+        """
+        Returns: The (leftmost, rightmost) x-coordinate of a live alien center, or None
+        if every alien is dead
+        """
+        if self.is_empty():
+            return None
+        return (float(self._x[0, self._left]), float(self._x[0, self._right]))
+
+    def bounds(self):
+        """
+        Returns: The bounding box (left, bottom, right, top) of the live aliens, or None
+        if every alien is dead
+        """
+        if self.is_empty():
+            return None
+        left = float(self._x[0, self._left]) - ALIEN_WIDTH/2.0
+        right = float(self._x[0, self._right]) + ALIEN_WIDTH/2.0
+        bottom = float(self._y[self._bottom, 0]) - ALIEN_HEIGHT/2.0
+        top = float(self._y[self._top, 0]) + ALIEN_HEIGHT/2.0
+        return (left, bottom, right, top)
+
+    def below(self, y):
+        """
+        Returns: True if the center of any live alien is below y; False otherwise
+
+        Parameter: y, the height to check
+        Precondition: Must be a number, int or float
+        """
+        return not self.is_empty() and float(self._y[self._bottom, 0]) < y
+
+    def lowest(self, col):
+        """
+        Returns: The row of the lowest live alien in column col, or None if the column
+        is empty
+
+        Parameter: col, the column to check
+        Precondition: Must be an int in 0..getCols()-1
+        """
+        row = self._lowest[col]
+        return None if row < 0 else row
+
+    def shooter(self, rng):
+        """
+        Returns: The (row, col) of the lowest live alien in a random column, or None if
+        every alien is dead
+
+        Every column with a live alien is equally likely to be chosen.
+
+        Parameter: rng, the random number generator to choose with
+        Precondition: Must be a random.Random
+        """
+        if len(self._columns) == 0:
+            return None
+        col = rng.choice(self._columns)
+        return (self._lowest[col], col)
+
+    def hits(self, rects, upward=True):
+        """
+        Returns: The (row, col) of the first live alien hit by each bolt, as a list with
+        None for each bolt that misses
+
+        Each rectangle is the path swept by a bolt in the last step, which may cross
+        several rows of aliens.  The column of each bolt is looked up in the lattice,
+        and then every row of that column is tested against the path in a single NumPy
+        operation.  The bolt hits the first live alien along its path.
+
+        Parameter rects: The paths swept by the bolts
+        Precondition: rects is array-like of shape (n,4), with rows of
+            (left, bottom, right, top)
+
+        Parameter upward: whether the bolts are moving up (so they hit the lowest alien
+            on their path first) or down (so they hit the highest)
+        Precondition: upward is a bool
+        """
+        rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+        rows, cols = self.getRows(), self.getCols()
+        xs = (rects[:, 0]+rects[:, 2])/2.0
+        c = self._column(xs)
+        inside = (c >= 0) & (c < cols)
+        c = np.clip(c, 0, cols-1)
+        cx = self._x[0, c]
+        inside &= (rects[:, 0] < cx+ALIEN_WIDTH/2.0) & (rects[:, 2] > cx-ALIEN_WIDTH/2.0)
+        # Test each path against every row of its column, shape (n, rows)
+        cy = self._y[:, 0]
+        crossed = ((rects[:, 1, None] < cy+ALIEN_HEIGHT/2.0) &
+                   (rects[:, 3, None] > cy-ALIEN_HEIGHT/2.0) &
+                   self._alive[:, c].T & inside[:, None])
+        if upward:
+            r = np.argmax(crossed, axis=1)
+        else:
+            r = rows-1 - np.argmax(crossed[:, ::-1], axis=1)
+        result = [None]*len(rects)
+        for i in np.flatnonzero(crossed.any(axis=1)).tolist():
+            result[i] = (int(r[i]), int(c[i]))
+        return result
+
+    # METHODS TO CHANGE THE FORMATION
+    def march(self, dx, dy):
+        """
+        Moves every alien in the formation by (dx, dy)
+
+        Parameter: dx, the number of pixels to move right (negative moves left)
+        Precondition: Must be a number, int or float
+
+        Parameter: dy, the number of pixels to move up (negative moves down)
+        Precondition: Must be a number, int or float
+        """
+        # The edges are row and column indices, so they move with the arrays
+        if dx:
+            self._x += dx
+        if dy:
+            self._y += dy
+
+    def kill(self, row, col):
+        """
+        Returns: The type of the alien killed, or None if it was already dead
+
+        Kills the alien at the given row and column
+
+        Parameter: row, the row of the alien
+        Precondition: Must be an int in 0..getRows()-1
+
+        Parameter: col, the column of the alien
+        Precondition: Must be an int in 0..getCols()-1
+        """
+        if not self._alive[row, col]:
+            return None
+        self._alive[row, col] = False
+        self._count -= 1
+        self._rowcount[row] -= 1
+        self._colcount[col] -= 1
+        # Move the lowest alien of the column up, removing the column if it is empty
+        if self._lowest[col] == row:
+            self._lowest[col] = self._next_alive(row+1, col)
+            if self._lowest[col] < 0:
+                self._remove_column(col)
+        # Shrink the edges past any rows or columns that are now empty
+        while self._left <= self._right and self._colcount[self._left] == 0:
+            self._left += 1
+        while self._right >= self._left and self._colcount[self._right] == 0:
+            self._right -= 1
+        while self._bottom <= self._top and self._rowcount[self._bottom] == 0:
+            self._bottom += 1
+        while self._top >= self._bottom and self._rowcount[self._top] == 0:
+            self._top -= 1
+        return int(self._kind[row, col])
+
+    # HELPER METHODS FOR THE COLUMN INDEX
+    def _column(self, xs):
+        """
+        Returns: The lattice column nearest to each x-coordinate, as an int array
+
+        The lattice is found from the alien in row 0 and column 0, which moves with the
+        rest of the formation whether or not it is alive.  A column outside of 0..cols-1
+        means the point is outside of the formation.
+
+        Parameter: xs, the x-coordinates to look up
+        Precondition: Must be a float array
+        """
+        return np.rint((xs - self._x[0, 0]) / (ALIEN_WIDTH+ALIEN_H_SEP)).astype(int)
+
+    def _next_alive(self, row, col):
+        """
+        Returns: The first row >= row with a live alien in column col, or -1 if none
+
+        Parameter: row, the row to start from
+        Precondition: Must be an int >= 0
+
+        Parameter: col, the column to search
+        Precondition: Must be an int in 0..getCols()-1
+        """
+        rows = self.getRows()
+        while row < rows and not self._alive[row, col]:
+            row += 1
+        return row if row < rows else -1
+
+    def _remove_column(self, col):
+        """
+        Removes an empty column from the list of live columns
+
+        The last column in the list takes its place, so this is O(1).
+
+        Parameter: col, the column to remove
+        Precondition: Must be an int in _columns
+        """
+        slot = self._colslot[col]
+        last = self._columns.pop()
+        if last != col:
+            self._columns[slot] = last
+            self._colslot[last] = slot
+        self._colslot[col] = -1
+
+
+class BoltStore(object):
+    """
+    A class representing the laser bolts in the simulation.
+
+    Like the formation, the bolts are stored as a structure of arrays.  There are
+    parallel NumPy arrays for the x-coordinates of the bolt centers, the y-coordinates,
+    the velocities and the owners (SHIP or ALIEN).  There is also an array of the
+    y-coordinates before the last step, so that collisions can be tested along the
+    whole path a bolt swept during that step.  Only the first count() entries are
+    in use.  The arrays double in size whenever they run out of room, so adding a bolt
+    is amortized O(1).
+
+    A bolt is removed by moving the last bolt into its slot, which is O(1) but changes
+    the order of the bolts.  To remove several bolts found in one pass, use remove_all,
+    which removes them in a single operation.  Never remove bolts one at a time while
+    looping over their indices.
+
+    Each bolt also has an id that never changes while it is on screen (even when it is
+    moved to another slot) and is never reused, so that a view layer can tell bolts
+    apart from one step to the next.
+
+    INSTANCE ATTRIBUTES:
+        _x:     the x-coordinates of the bolt centers [float array]
+        _y:     the y-coordinates of the bolt centers [float array]
+        _py:    the y-coordinates of the bolt centers before the last step [float array]
+        _vy:    the velocities in y direction [float array]
+        _owner: who fired each bolt [int array of SHIP or ALIEN]
+        _id:    the id of each bolt [int array]
+        _count: the number of bolts in use [int >= 0]
+        _owned: the number of bolts fired by each owner [list of two int >= 0]
+        _nextid: the id of the next bolt added [int >= 0]
+    """
+    # The owners of a bolt
+    SHIP = 0
+    ALIEN = 1
+
+    # GETTERS
+    def getX(self):
+        """
+        Returns: The array of bolt x-coordinates (do not modify it)
+        """
+        return self._x[:self._count]
+
+    def getY(self):
+        """
+        Returns: The array of bolt y-coordinates (do not modify it)
+        """
+        return self._y[:self._count]
+
+    def getPreviousY(self):
+        """
+        Returns: The array of bolt y-coordinates before the last step (do not modify it)
+        """
+        return self._py[:self._count]
+
+    def getVelocity(self):
+        """
+        Returns: The array of bolt velocities (do not modify it)
+        """
+        return self._vy[:self._count]
+
+    def getOwner(self):
+        """
+        Returns: The array of bolt owners (do not modify it)
+        """
+        return self._owner[:self._count]
+
+    def getIds(self):
+        """
+        Returns: The array of bolt ids (do not modify it)
+        """
+        return self._id[:self._count]
+
+    # INITIALIZER TO CREATE AN EMPTY STORE
+    def __init__(self, capacity=16):
+        """
+        Creates an empty bolt store
+
+        Parameter: capacity, the number of bolts to make room for ahead of time
+        Precondition: Must be an int > 0
+        """
+        self._x = np.zeros(capacity)
+        self._y = np.zeros(capacity)
+        self._py = np.zeros(capacity)
+        self._vy = np.zeros(capacity)
+        self._owner = np.zeros(capacity, dtype=int)
+        self._id = np.zeros(capacity, dtype=int)
+        self._count = 0
+        self._owned = [0, 0]
+        self._nextid = 0
+
+    def __len__(self):
+        """
+        Returns: The number of bolts on screen
+        """
+        return self._count
+
+    # METHODS TO QUERY THE BOLTS
+    def owned(self, owner):
+        """
+        Returns: The number of bolts on screen fired by owner
+
+        Parameter: owner, who fired the bolts
+        Precondition: Must be SHIP or ALIEN
+        """
+        return self._owned[owner]
+
+    def bounds(self):
+        """
+        Returns: The bounding boxes of the bolts as an array of shape (count(), 4), with
+        rows of (left, bottom, right, top)
+        """
+        x = self.getX()
+        y = self.getY()
+        return np.stack((x-BOLT_WIDTH/2.0, y-BOLT_HEIGHT/2.0,
+                         x+BOLT_WIDTH/2.0, y+BOLT_HEIGHT/2.0), axis=1)
+
+    def swept(self, reach=0):
+        """
+        Returns: The paths swept by the bolts in the last step as an array of shape
+        (count(), 4), with rows of (left, bottom, right, top)
+
+        Each path is the smallest rectangle containing the bolt both before and after
+        the step.  A bolt added since the last step has only its bounding box.  So does
+        a bolt that moved no more than reach: a test at its new position cannot jump
+        over a target taller than that, so a normal step gives the same hits as it did
+        before bolts were swept.
+
+        Parameter: reach, the distance a bolt may move and still be tested where it is
+        Precondition: Must be a number, int or float >= 0
+        """
+        x = self.getX()
+        y = self.getY()
+        py = np.where(np.abs(y-self.getPreviousY()) > reach, self.getPreviousY(), y)
+        lo = np.minimum(py, y)
+        hi = np.maximum(py, y)
+        return np.stack((x-BOLT_WIDTH/2.0, lo-BOLT_HEIGHT/2.0,
+                         x+BOLT_WIDTH/2.0, hi+BOLT_HEIGHT/2.0), axis=1)
+
+    # METHODS TO CHANGE THE BOLTS
+    def add(self, x, y, velocity, owner):
+        """
+        Returns: The id of a new bolt at (x, y)
+
+        Parameter: x, x-coordinate of bolt center
+        Precondition: Must be a number, int or float
+
+        Parameter: y, y-coordinate of bolt center
+        Precondition: Must be a number, int or float
+
+        Parameter: velocity, how far the bolt moves each step
+        Precondition: Must be a number, int or float
+
+        Parameter: owner, who fired the bolt
+        Precondition: Must be SHIP or ALIEN
+        """
+        n = self._count
+        if n == len(self._x):
+            self._grow(2*n)
+        self._x[n] = x
+        self._y[n] = y
+        self._py[n] = y
+        self._vy[n] = velocity
+        self._owner[n] = owner
+        self._id[n] = self._nextid
+        self._nextid += 1
+        self._count += 1
+        self._owned[owner] += 1
+        return int(self._id[n])
+
+    def remove(self, index):
+        """
+        Removes the bolt in the given slot, moving the last bolt into its place
+
+        Parameter: index, the slot of the bolt to remove
+        Precondition: Must be an int in 0..count()-1
+        """
+        last = self._count-1
+        self._owned[self._owner[index]] -= 1
+        if index != last:
+            self._x[index] = self._x[last]
+            self._y[index] = self._y[last]
+            self._py[index] = self._py[last]
+            self._vy[index] = self._vy[last]
+            self._owner[index] = self._owner[last]
+            self._id[index] = self._id[last]
+        self._count = last
+
+    def remove_all(self, mask):
+        """
+        Removes every bolt where mask is True, keeping the others in order
+
+        Parameter: mask, which bolts to remove
+        Precondition: Must be a bool array of length count()
+        """
+        keep = np.flatnonzero(~np.asarray(mask, dtype=bool))
+        n = len(keep)
+        if n == self._count:
+            return
+        for array in (self._x, self._y, self._py, self._vy, self._owner, self._id):
+            array[:n] = array[keep]
+        self._count = n
+        ship = int(np.count_nonzero(self._owner[:n] == self.SHIP))
+        self._owned = [ship, n-ship]
+
+    def integrate(self, scale=1):
+        """
+        Moves every bolt by its velocity in a single vectorized step
+
+        The position before the step is remembered for swept.
+
+        Parameter: scale, the number of updates this step stands for
+        Precondition: Must be a number, int or float >= 0
+        """
+        n = self._count
+        self._py[:n] = self._y[:n]
+        self._y[:n] += self._vy[:n]*scale
+
+    def clear(self):
+        """
+        Removes every bolt
+        """
+        self._count = 0
+        self._owned = [0, 0]
+
+    # HELPER METHOD TO MAKE ROOM
+    def _grow(self, capacity):
+        """
+        Makes room for capacity bolts, keeping the bolts in use
+
+        Parameter: capacity, the new number of slots
+        Precondition: Must be an int >= count()
+        """
+        n = self._count
+        for name in ('_x', '_y', '_py', '_vy', '_owner', '_id'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
+
+class WaveState(object):
+    """
+    This class is the simulation core of a single wave of Alien Invaders.
+
+    It contains all of the game logic of a wave: moving the ship, marching the aliens,
+    firing and moving the laser bolts, and resolving collisions.  Each call to step
+    advances the wave by one update.  Anything that would make a sound is recorded in
+    the list of events for that step, so that a view layer can react to it.
+
+    INSTANCE ATTRIBUTES:
+        _ship:   the player ship [Body, or None if the ship is destroyed]
+        _aliens: the aliens in the wave [Formation]
+        _bolts:  the laser bolts currently on screen [BoltStore]
+        _lives:  the number of lives left  [int >= -1]
+        _time:   The amount of time since the last Alien "step" [number >= 0, and less
+                 than _alienspeed after each step]
+        _adirect: the direction that the aliens are moving [string "right" or "left"]
+        _afirerate: the number of steps the aliens will take before firing [int in 1..BOLT_RATE]
+        _asteps: the number of steps the aliens have taken since last firing [int >= 0]
+        _lostlives: the number of lives the player lost in the current round[int >= 0]
+        _alienspeed: the number of seconds (0 < float <= 1) between alien steps
+        _roundscore: the score that the player has achieved in the current round[int >= 0]
+                 (it only changes when an alien is killed)
+        _events: the events that happened in the last step [list of strings from
+                 'shipbolt', 'alienbolt', 'shipdie' and 'aliendie']
+        _rng:    the random number generator for every random decision in the wave
+                 [random.Random]
+    """
+
+    # GETTERS AND SETTERS
+    def getShip(self):
+        """
+        Returns: The ship body, or None if the ship is destroyed
+        """
+        return self._ship
+
+    def getAliens(self):
+        """
+        Returns: The formation of aliens in the wave
+        """
+        return self._aliens
+
+    def getAlienBounds(self):
+        """
+        Returns: The bounding box (left, bottom, right, top) of the live aliens, or None
+        if every alien is dead
+        """
+        return self._aliens.bounds()
+
+    def getBolts(self):
+        """
+        Returns: The store of laser bolts currently on screen
+        """
+        return self._bolts
+
+    def getEvents(self):
+        """
+        Returns: The list of events that happened in the last step
+        """
+        return self._events
+
+    def getLives(self):
+        """
+        Returns: The number of lives remaining
+        """
+        return self._lives
+
+    def setLives(self, lives):
+        """
+        Sets the number of lives the player has.
+
+        Parameter: lives
+        Precondtion: Must be an int
+        """
+        self._lives = lives
+
+    def getAlienSpeed(self):
+        """
+        Returns: The number of seconds between alien steps
+        """
+        return self._alienspeed
+
+    def setAlienSpeed(self, speed):
+        """
+        Sets the number of seconds between alien steps to the speed given
+
+        Parameter: Speed
+        Precondtion: Must be an float
+        """
+        self._alienspeed = speed
+
+    def getRoundScore(self):
+        """
+        Returns: the score that the player has achieved in the current round
+        """
+        return self._roundscore
+
+    # INITIALIZER TO CREATE SHIP AND ALIENS
+    def __init__(self, seed=None, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW):
+        """
+        Initializes the simulation of a wave.
+
+        The wave owns its random number generator.  Two waves with the same seed that
+        are given the same keys and times make exactly the same decisions.
+
+        Parameter: seed, the seed for the random number generator
+        Precondition: Must be an int, or None to seed from the system
+
+        Parameter: rows, the number of rows of aliens
+        Precondition: Must be an int > 0
+
+        Parameter: cols, the number of aliens in each row
+        Precondition: Must be an int > 0
+        """
+        self._rng = random.Random(seed)
+        self._aliens = Formation(rows, cols)
+        self._create_ship()
+        self._adirect = "right"
+        self._time = 0
+        self._bolts = BoltStore()
+        self._alienspeed = ALIEN_SPEED
+        self._afirerate = self._rng.randint(1, BOLT_RATE)
+        self._asteps = 0
+        self._lives = SHIP_LIVES
+        self._lostlives = 0
+        self._roundscore = 0
+        self._events = []
+
+    # STEP METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
+    def step(self, keys, dt):
+        """
+        Advances the wave by a single update.
+
+        The ship and the bolts move by their speed for every GAME_TIMESTEP in dt, so a
+        headless wave can be stepped with a much larger dt.  Bolts are tested along the
+        whole path they moved, so they never pass through a target in a large step.
+
+        Parameter: keys, the keys currently held down
+        Precondition: Must be a sequence of key names (possibly empty)
+
+        Parameter: dt, the time in seconds since the last step
+        Precondition: Must be a number (int or float) >= 0
+        """
+        self._events = []
+        scale = dt/GAME_TIMESTEP
+        self._update_ship(keys, scale)
+        self._update_aliens(dt)
+        self._update_bolts(keys, scale)
+
+    # Helper Methods for multiple lives
+    def lives_left(self):
+        """
+        Returns True if the player has any lives remaining; False otherwise
+        """
+        return self._lives >= 0
+
+    def new_life(self):
+        """
+        Creates a new ship to begin a new life for the player
+        """
+        self._create_ship()
+
+    # Methods to Create Bodies
+    def _create_ship(self):
+        """
+        Creates the ship body at the bottom center of the screen
+        """
+        x = GAME_WIDTH/2
+        y = SHIP_BOTTOM + (SHIP_HEIGHT/2)
+        self._ship = Body(x, y, SHIP_WIDTH, SHIP_HEIGHT)
+
+    # Update Ship
+    def _update_ship(self, keys, scale):
+        """
+        Moves the ship left or right and checks if it has been hit by a bolt.
+
+        Parameter: keys, the keys currently held down
+        Precondition: Must be a sequence of key names (possibly empty)
+
+        Parameter: scale, the number of updates this step stands for
+        Precondition: Must be a number, int or float >= 0
+        """
+        if not self._ship is None:
+            # Move ship left or right as necessary
+            if "left" in keys:
+                self._ship.x -= SHIP_MOVEMENT*scale
+            if "right" in keys:
+                self._ship.x += SHIP_MOVEMENT*scale
+            # Check if ship went off-screen and move it back
+            if self._ship.x + SHIP_WIDTH > GAME_WIDTH:
+                self._ship.x -= GAME_WIDTH
+            if self._ship.x - SHIP_WIDTH < 0:
+                self._ship.x += GAME_WIDTH
+            # Call helper to see if ship was hit
+            self._kill_ship()
+
+    # Update Aliens
+    def _update_aliens(self, dt):
+        """
+        Marches the aliens if enough time has passed and removes the aliens that died.
+
+        The aliens march once for every _alienspeed seconds that have passed, so a large
+        dt may march them several times.  The time left over is kept for the next step.
+
+        Parameter: dt, the time in seconds since the last step
+        Precondition: Must be a number (int or float) >= 0
+        """
+        # Call helper to see if all aliens have been destroyed
+        self._check_win()
+
+        # March once for every alien step that has passed, stopping if the wave ended
+        self._time += dt
+        while self._time >= self._alienspeed and self._lives >= 0:
+            self._move_aliens()  # Checks the edges and the defense line each march
+            self._time -= self._alienspeed
+
+        # Call helper to check if any aliens have been killed
+        self._kill_aliens()
+
+    def _move_aliens(self):
+        """
+        Moves the aliens down, left or right as necessary
+        """
+        self._asteps += 1  # Keep track of number of steps taken to see when to fire
+        extent = self._aliens.extent()
+        if extent is None:
+            self._check_win()
+        else:
+            furthest_left, furthest_right = extent
+            # Move down and march left
+            if furthest_right > GAME_WIDTH - ALIEN_H_SEP and self._adirect == "right":
+                self._move_aliens_down()
+                self._adirect = "left"
+            # Move down and march right
+            if furthest_left < ALIEN_H_SEP and self._adirect == "left":
+                self._move_aliens_down()
+                self._adirect = "right"
+            # March left or right
+            if self._adirect == "left":
+                self._aliens.march(-ALIEN_H_WALK, 0)
+            if self._adirect == "right":
+                self._aliens.march(ALIEN_H_WALK, 0)
+
+    def _move_aliens_down(self):
+        """
+        Moves the aliens down ALIEN_V_WALK, ending the wave if they pass the defense line
+        """
+        self._aliens.march(0, -ALIEN_V_WALK)
+        if self._aliens.below(DEFENSE_LINE):
+            # Set lives to -1 and ship to None so Invaders update
+            # takes care of ending the round in the next frame
+            self._lives = -1
+            self._ship = None
+
+    # Update Bolts
+    def _update_bolts(self, keys, scale):
+        """
+        Creates and moves bolts
+
+        Bolts that leave the screen are removed in the same step, as before bolts were
+        swept.  Their last path is tested for collisions first, since a large step may
+        take a bolt through a target and off the screen at once.
+
+        Parameter: keys, the keys currently held down
+        Precondition: Must be a sequence of key names (possibly empty)
+
+        Parameter: scale, the number of updates this step stands for
+        Precondition: Must be a number, int or float >= 0
+        """
+        # Create Ship Bolts
+        if "up" in keys and (not self._ship is None) and self._ship_can_fire():
+            x = self._ship.x
+            y = self._ship.y + (SHIP_HEIGHT/2)
+            self._bolts.add(x, y, BOLT_SPEED, BoltStore.SHIP)
+            self._events.append('shipbolt')
+
+        # Create Alien Bolts (a large step may march far enough for several)
+        while self._asteps >= self._afirerate:  # Check if aliens have taken enough steps
+            self._fire_alien_bolt()
+            self._asteps -= self._afirerate
+
+        # Move Bolts, keeping only the ones still on screen
+        self._bolts.integrate(scale)
+        ys = self._bolts.getY()
+        gone = (ys > GAME_HEIGHT) | (ys < 0)
+        if gone.any():
+            self._kill_aliens(gone)
+            self._kill_ship(gone)
+            ys = self._bolts.getY()
+            self._bolts.remove_all((ys > GAME_HEIGHT) | (ys < 0))
+
+    def _fire_alien_bolt(self):
+        """
+        Fires a bolt from the lowest alien in a random column
+        """
+        # Choose the lowest alien in a random column with at least one alien in it
+        shooter = self._aliens.shooter(self._rng)
+        if shooter is None:
+            return
+        row, col = shooter
+        # Make Bolt Velocity negative to show alien bolt
+        x = float(self._aliens.getX()[row, col])
+        y = float(self._aliens.getY()[row, col]) - (ALIEN_HEIGHT/2)
+        self._bolts.add(x, y, -1 * BOLT_SPEED, BoltStore.ALIEN)
+        self._events.append('alienbolt')
+
+    def _ship_can_fire(self):
+        """
+        Returns: True if the player has fewer than SHIP_BOLT_LIMIT bolts on screen
+        """
+        return self._bolts.owned(BoltStore.SHIP) < SHIP_BOLT_LIMIT
+
+    # Methods to Handle Collisions
+    def _kill_aliens(self, mask=None):
+        """
+        Removes any alien hit by a ship bolt, along with the bolt that hit it.
+
+        The paths of all of the ship bolts are tested against the alien lattice in one
+        batch.  If two bolts hit the same alien, only the first one is used up.  The
+        spent bolts are removed together once every hit has been resolved.
+
+        Parameter: mask, the bolts to test (None for every bolt)
+        Precondition: Must be a bool array with one entry per bolt, or None
+        """
+        if self._bolts.owned(BoltStore.SHIP) == 0:
+            return
+        owned = self._bolts.getOwner() == BoltStore.SHIP
+        ship_bolts = np.flatnonzero(owned if mask is None else owned & mask)
+        if len(ship_bolts) == 0:
+            return
+        hits = self._aliens.hits(self._bolts.swept(ALIEN_HEIGHT)[ship_bolts], True)
+        spent = np.zeros(len(self._bolts), dtype=bool)
+        for index, hit in zip(ship_bolts.tolist(), hits):
+            if not hit is None:
+                kind = self._aliens.kill(hit[0], hit[1])
+                if not kind is None:
+                    # Kill Alien, Add Score, Remove Bolt, Change Speed
+                    self._roundscore += ALIEN_TYPE_POINTS[kind]
+                    self._events.append('aliendie')
+                    self.setAlienSpeed(self._alienspeed * A_SPEED_FAC)
+                    spent[index] = True
+        self._bolts.remove_all(spent)
+
+    def _kill_ship(self, mask=None):
+        """
+        Destroys the ship if it has been hit by an alien bolt.
+
+        The paths of all of the alien bolts are tested against the ship in one batch.
+        Only the first bolt to hit the ship is used up.
+
+        Parameter: mask, the bolts to test (None for every bolt)
+        Precondition: Must be a bool array with one entry per bolt, or None
+        """
+        if self._ship is None or self._bolts.owned(BoltStore.ALIEN) == 0:
+            return
+        owned = self._bolts.getOwner() == BoltStore.ALIEN
+        alien_bolts = np.flatnonzero(owned if mask is None else owned & mask)
+        if len(alien_bolts) == 0:
+            return
+        hits = aabb_hits(self._bolts.swept(SHIP_HEIGHT)[alien_bolts], [self._ship.bounds()])[0]
+        if len(hits) > 0:
+            # Kill Ship, Remove Bolt, Change Lives
+            self._ship = None
+            self._events.append('shipdie')
+            self._lives -= 1
+            self._lostlives += 1
+            self._bolts.remove(int(alien_bolts[hits[0]]))
+
+    # Method to See if the round has been completed
+    def _check_win(self):
+        """
+        Sets the number of lives to -1 if all of the aliens have been destroyed, so
+        that Invaders will start a new round.
+        """
+        # Check if all of the aliens in the wave are dead
+        if self._aliens.is_empty():
+            self._lives = -1
+            self._bolts.clear()
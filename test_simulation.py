@@ -0,0 +1,186 @@
+"""
+Unit tests for the headless simulation core
+
+These tests never create a Kivy object, so they run without a window.  Run them from
+the folder of the game with
+
+    python -m pytest -q
+"""
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from consts import *
+from simulation import BoltStore, Formation, WaveState
+
+
+def run(dt, keys=(), seconds=20, seed=7):
+    """
+    Returns: The wave state after playing it for the given time, and the number of
+    times the aliens marched
+
+    Parameter: dt, the time of each step
+    Precondition: Must be a float > 0
+
+    Parameter: keys, the keys held down the whole time
+    Precondition: Must be a sequence of key names
+
+    Parameter: seconds, the time to play for
+    Precondition: Must be a number > 0
+
+    Parameter: seed, the seed of the wave
+    Precondition: Must be an int
+    """
+    state = WaveState(seed)
+    marches = [0]
+    move = state._move_aliens
+    def counted():
+        marches[0] += 1
+        move()
+    state._move_aliens = counted
+    for _ in range(int(round(seconds/dt))):
+        state.step(keys, dt)
+        if state.getShip() is None and state.lives_left():
+            state.new_life()
+    return state, marches[0]
+
+
+@pytest.mark.parametrize('dt', [0.1, 0.5, 1.0])
+def test_march_count_ignores_step_size(dt):
+    """The aliens march as often at a large step as at the normal one"""
+    _, expected = run(GAME_TIMESTEP)
+    _, marches = run(dt)
+    assert marches == expected
+
+
+@pytest.mark.parametrize('dt', [0.05, 0.1])
+def test_score_ignores_step_size(dt):
+    """A larger step plays about the same game (within 10% of the score)"""
+    expected = run(GAME_TIMESTEP, ('up',))[0].getRoundScore()
+    score = run(dt, ('up',))[0].getRoundScore()
+    assert expected > 0
+    assert abs(score-expected) <= 0.1*expected
+
+
+def test_seed_is_deterministic():
+    """Two waves with the same seed and keys play exactly the same game"""
+    first = WaveState(42)
+    second = WaveState(42)
+    for frame in range(3000):
+        keys = ('up', 'left') if (frame//200) % 2 else ('up', 'right')
+        first.step(keys, GAME_TIMESTEP)
+        second.step(keys, GAME_TIMESTEP)
+        assert first.getEvents() == second.getEvents()
+        if first.getShip() is None and first.lives_left():
+            first.new_life()
+            second.new_life()
+    assert first.getRoundScore() == second.getRoundScore()
+    assert first.getLives() == second.getLives()
+    assert np.array_equal(first.getAliens().getAlive(), second.getAliens().getAlive())
+    assert np.array_equal(first.getBolts().getY(), second.getBolts().getY())
+
+
+def test_formation_edges_after_kills():
+    """The edges, lowest aliens and live columns match the alive mask after every kill"""
+    formation = Formation(5, 11)
+    rng = random.Random(3)
+    cells = [(r, c) for r in range(5) for c in range(11)]
+    rng.shuffle(cells)
+    for row, col in cells:
+        assert formation.kill(row, col) == int(formation.getKind()[row, col])
+        assert formation.kill(row, col) is None
+        alive = formation.getAlive()
+        assert formation.count() == int(alive.sum())
+        for c in range(11):
+            rows = np.flatnonzero(alive[:, c])
+            assert formation.lowest(c) == (int(rows[0]) if len(rows) else None)
+        cols = np.flatnonzero(alive.any(axis=0)).tolist()
+        assert sorted(formation._columns) == cols
+        if cols:
+            rows = np.flatnonzero(alive.any(axis=1))
+            x = formation.getX()[0]
+            y = formation.getY()[:, 0]
+            assert formation.extent() == (x[cols[0]], x[cols[-1]])
+            assert formation.bounds() == (x[cols[0]]-ALIEN_WIDTH/2.0,
+                                          y[rows[0]]-ALIEN_HEIGHT/2.0,
+                                          x[cols[-1]]+ALIEN_WIDTH/2.0,
+                                          y[rows[-1]]+ALIEN_HEIGHT/2.0)
+        else:
+            assert formation.is_empty() and formation.extent() is None
+
+
+def test_formation_hits_the_column_of_each_alien():
+    """A bolt on an alien hits that alien, and only while it is alive"""
+    formation = Formation(5, 11)
+    formation.march(7, -3)
+    formation.kill(0, 4)
+    xs = formation.getX()
+    ys = formation.getY()
+    rects = [(xs[r, c]-BOLT_WIDTH/2.0, ys[r, c]-BOLT_HEIGHT/2.0,
+              xs[r, c]+BOLT_WIDTH/2.0, ys[r, c]+BOLT_HEIGHT/2.0)
+             for r in range(5) for c in range(11)]
+    hits = formation.hits(rects)
+    for (r, c), hit in zip([(r, c) for r in range(5) for c in range(11)], hits):
+        assert hit == (None if (r, c) == (0, 4) else (r, c))
+
+
+def check_bolts(store, ids):
+    """
+    Checks that the parallel arrays of store still describe the bolts in ids
+
+    Each bolt was added at (id, 2*id) with velocity 3*id and owner id % 2.
+
+    Parameter: store, the bolts to check
+    Precondition: Must be a BoltStore
+
+    Parameter: ids, the ids of the bolts that should be in the store
+    Precondition: Must be a set of int
+    """
+    found = store.getIds()
+    assert len(store) == len(ids) and set(found.tolist()) == ids
+    assert np.array_equal(store.getX(), found)
+    assert np.array_equal(store.getY(), 2*found)
+    assert np.array_equal(store.getPreviousY(), 2*found)
+    assert np.array_equal(store.getVelocity(), 3*found)
+    assert np.array_equal(store.getOwner(), found % 2)
+    ship = sum(1 for key in ids if key % 2 == BoltStore.SHIP)
+    assert store.owned(BoltStore.SHIP) == ship
+    assert store.owned(BoltStore.ALIEN) == len(ids)-ship
+
+
+def test_bolt_store_keeps_arrays_in_sync():
+    """Removing bolts one at a time or by mask keeps every array in step"""
+    store = BoltStore(capacity=2)
+    ids = set()
+    for key in range(40):
+        assert store.add(key, 2*key, 3*key, key % 2) == key
+        ids.add(key)
+    check_bolts(store, ids)
+    rng = random.Random(5)
+    for _ in range(10):
+        index = rng.randrange(len(store))
+        ids.discard(int(store.getIds()[index]))
+        store.remove(index)
+        check_bolts(store, ids)
+    mask = store.getIds() % 3 == 0
+    ids -= set(store.getIds()[mask].tolist())
+    store.remove_all(mask)
+    check_bolts(store, ids)
+    store.remove_all(np.ones(len(store), dtype=bool))
+    check_bolts(store, set())
+
+
+def test_core_imports_no_kivy():
+    """Importing and stepping the simulation core loads neither Kivy nor drawables"""
+    code = ('import sys, simulation\n'
+            'simulation.WaveState(1).step(("up",), 1/60)\n'
+            'print(sorted(m for m in sys.modules if m.split(".")[0] in '
+            '("kivy", "introcs", "models") or m in ("game2d.gobject", "game2d.app")))')
+    folder = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, '-c', code], cwd=folder,
+                            capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == '[]'